@@ -1,47 +1,131 @@
 from crewai import Agent
-from openai import OpenAI
+from openai import OpenAI, RateLimitError, APIStatusError, APIConnectionError, APITimeoutError
 from datetime import datetime, timedelta
+import re
 import requests
 from typing import List, Dict, Any
 import config
-import os
-import json
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor, wait
+from article_store import article_store
+from article_record import ArticleRecord
+from rate_limiter import perigon_limiter, openai_limiter, perigon_breaker, openai_breaker, CircuitOpenError
+from summary_cache import summary_cache, article_key, set_fingerprint
+from topic_tracker import TopicTracker, article_topic_weights
+from page_parser import parse_pool
+from deadline import DeadlineExceeded, NO_DEADLINE
+
+# Endpoints can be pointed at local mock backends from config.py (see mock_backends.py)
+PERIGON_API_URL = getattr(config, "PERIGON_API_URL", "https://api.goperigon.com/v1/all")
+OPENAI_BASE_URL = getattr(config, "OPENAI_BASE_URL", None)
+
+# An earlier executive summary is reused when its articles cover this share of
+# the new top articles; new articles from this importance up are added to it
+SUMMARY_REUSE_OVERLAP = getattr(config, "SUMMARY_REUSE_OVERLAP", 0.8)
+SUMMARY_DELTA_MIN_IMPORTANCE = getattr(config, "SUMMARY_DELTA_MIN_IMPORTANCE", 7)
+
+# Article pages downloaded at the same time during a fetch
+DOWNLOAD_WORKERS = getattr(config, "DOWNLOAD_WORKERS", 8)
+# Share of the time left before a refresh deadline that page extraction may use,
+# so articles can still be summarized from their description afterwards
+EXTRACTION_DEADLINE_SHARE = getattr(config, "EXTRACTION_DEADLINE_SHARE", 0.5)
+
+class NewsSourceUnavailable(Exception):
+    """Raised when Perigon cannot be queried, so an outage is not mistaken for no news."""
+
+def openai_chat_completion(client, max_attempts=3, deadline=None, **kwargs):
+    """Create a chat completion through the shared rate limiter and circuit breaker.
+
+    The client's own retries are disabled; 429s are retried here after the
+    limiter has paused for the server's Retry-After. Raises CircuitOpenError
+    without calling the API while the breaker is open, and DeadlineExceeded
+    when ``deadline`` (a Deadline) runs out before the completion arrives.
+    """
+    deadline = deadline or NO_DEADLINE
+    for attempt in range(max_attempts):
+        trial = openai_breaker.before_call()
+        try:
+            if not openai_limiter.acquire(timeout=deadline.remaining()):
+                raise DeadlineExceeded("Refresh deadline passed while waiting for the OpenAI rate limit")
+            if deadline.expires_at is not None:
+                kwargs["timeout"] = deadline.timeout(None)
+            try:
+                raw_response = client.chat.completions.with_raw_response.create(**kwargs)
+            except RateLimitError as e:
+                openai_limiter.record_rate_limited(e.response.headers)
+                openai_breaker.record_failure()
+                if attempt == max_attempts - 1:
+                    raise
+                continue
+            except APIStatusError as e:
+                # A 4xx is a bad request, but the service itself answered
+                if e.status_code >= 500:
+                    openai_breaker.record_failure()
+                else:
+                    openai_breaker.record_success()
+                raise
+            except APITimeoutError:
+                # Cut short by the refresh deadline, which says nothing about the service
+                if deadline.expired():
+                    raise DeadlineExceeded("Refresh deadline passed during an OpenAI call") from None
+                openai_breaker.record_failure()
+                raise
+            except APIConnectionError:
+                openai_breaker.record_failure()
+                raise
+
+            openai_limiter.record_success(raw_response.headers)
+            openai_breaker.record_success()
+            return raw_response.parse()
+        finally:
+            # A trial that ended without an outcome (e.g. the deadline) must not block the breaker
+            if trial:
+                openai_breaker.release_trial()
 
 class NewsExtractorTools:
-    def extract_content_from_url(self, url: str) -> str:
-        """Extract article content from a given URL using BeautifulSoup."""
+    def extract_content_from_url(self, url: str, deadline=None) -> str:
+        """Extract article content from a given URL using BeautifulSoup.
+
+        The raw page is parsed in the shared parsing process pool. Timeouts
+        are capped at the time left before ``deadline``.
+        """
+        deadline = deadline or NO_DEADLINE
         try:
-            response = requests.get(url, timeout=10)
+            response = requests.get(url, timeout=deadline.timeout(10))
             if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Remove script and style elements
-                for element in soup(['script', 'style']):
-                    element.decompose()
-                
-                # Get text content
-                text = soup.get_text(separator='\n', strip=True)
-                
-                # Clean up the text
-                lines = [line.strip() for line in text.splitlines() if line.strip()]
-                content = '\n'.join(lines)
-                
-                return content
+                # Only a declared charset is passed on; otherwise BeautifulSoup detects it
+                declared = "charset" in response.headers.get("content-type", "").lower()
+                return parse_pool.clean(
+                    response.content, response.encoding if declared else None, timeout=deadline.remaining()
+                )
+            return ""
+        except DeadlineExceeded:
             return ""
         except Exception as e:
             print(f"Error extracting content from {url}: {str(e)}")
             return ""
 
-    def fetch_latest_ai_news(self, query_terms=None, days=7, article_count=10, save_results=False):
-        """Fetch AI-related news from Perigon API."""
+    def fetch_latest_ai_news(self, query_terms=None, days=7, article_count=10, save_results=False, sources=None,
+                             deadline=None):
+        """Fetch AI-related news from Perigon API.
+
+        ``sources`` (domains) is sent to Perigon as repeated ``source``
+        parameters and also checked locally before any page is downloaded.
+        Page extraction may use ``EXTRACTION_DEADLINE_SHARE`` of the time left
+        before ``deadline`` (a Deadline); pages not extracted by then fall back
+        to Perigon's content or description and are marked "description_only".
+
+        Raises NewsSourceUnavailable when Perigon fails, is rate limited or its
+        circuit breaker is open, and DeadlineExceeded if the deadline passes
+        before the request is sent.
+        """
+        deadline = deadline or NO_DEADLINE
         try:
             query = query_terms or "Artificial Intelligence OR AI OR machine learning OR LLM"
             
             end_date = datetime.today().strftime('%Y-%m-%d')  
             start_date = (datetime.today() - timedelta(days=days)).strftime('%Y-%m-%d')
 
-            url = "https://api.goperigon.com/v1/all"
+            url = PERIGON_API_URL
             params = {
                 "apiKey": config.PERIGON_API_KEY,
                 "q": query,
@@ -51,57 +135,97 @@ class NewsExtractorTools:
                 "language": "en",
                 "size": article_count
             }
+            if sources:
+                # requests repeats the parameter for each list item
+                params["source"] = list(sources)
 
-            response = requests.get(url, params=params, timeout=10)
+            trial = perigon_breaker.before_call()
+            try:
+                if not perigon_limiter.acquire(timeout=deadline.remaining()):
+                    raise DeadlineExceeded("Refresh deadline passed while waiting for the Perigon rate limit")
+                try:
+                    response = requests.get(url, params=params, timeout=deadline.timeout(10))
+                except requests.RequestException:
+                    perigon_breaker.record_failure()
+                    raise
+                
+                if response.status_code == 429:
+                    perigon_limiter.record_rate_limited(response.headers)
+                    perigon_breaker.record_failure()
+                elif response.status_code >= 500:
+                    perigon_breaker.record_failure()
+                else:
+                    perigon_limiter.record_success(response.headers)
+                    perigon_breaker.record_success()
+            finally:
+                if trial:
+                    perigon_breaker.release_trial()
+            
             if response.status_code == 200:
                 articles = response.json().get("articles", [])
                 
-                normalized_articles = []
+                wanted = []
                 for article in articles:
-                    article_url = article.get("url", "")
-                    # Extract content from URL if available
-                    extracted_content = self.extract_content_from_url(article_url) if article_url else ""
-                    
-                    normalized_article = {
-                        "title": article.get("title", "Untitled"),
-                        "url": article_url,
-                        "publishedAt": article.get("pubDate", article.get("publishedAt", "")),
-                        "description": article.get("description", ""),
-                        "content": extracted_content or article.get("content", ""),
-                        "source": {
-                            "name": article.get("source", {}).get("domain", 
-                                    article.get("source", {}).get("name", "Unknown Source"))
-                        }
-                    }
+                    source_name = article.get("source", {}).get("domain",
+                                  article.get("source", {}).get("name", "Unknown Source"))
+                    # Unwanted sources are dropped before their page is downloaded
+                    if sources and source_name not in sources:
+                        continue
+                    wanted.append((article, source_name))
+                
+                # Extract content from the URLs, downloading several pages at once
+                extraction_deadline = deadline.share(EXTRACTION_DEADLINE_SHARE)
+                downloads = ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS, thread_name_prefix="download")
+                extractions = [
+                    downloads.submit(self.extract_content_from_url, article["url"], extraction_deadline)
+                    if article.get("url") else None
+                    for article, _ in wanted
+                ]
+                wait([f for f in extractions if f is not None], timeout=extraction_deadline.remaining())
+                # Downloads still running at the deadline are left to time out on their own
+                downloads.shutdown(wait=False, cancel_futures=True)
+                
+                normalized_articles = []
+                for (article, source_name), extraction in zip(wanted, extractions):
+                    normalized_article = ArticleRecord(
+                        title=article.get("title", "Untitled"),
+                        url=article.get("url", ""),
+                        publishedAt=article.get("pubDate", article.get("publishedAt", "")),
+                        description=article.get("description", ""),
+                        source={"name": source_name}
+                    )
+                    # Downloads still queued at the deadline were cancelled, which also counts as done
+                    if extraction is not None and (extraction.cancelled() or not extraction.done()):
+                        normalized_article.update(
+                            content=article.get("content") or article.get("description", ""),
+                            status="description_only",
+                            error="Page text was not extracted before the deadline"
+                        )
+                    else:
+                        extracted_content = extraction.result() if extraction is not None else ""
+                        normalized_article["content"] = extracted_content or article.get("content", "")
                     normalized_articles.append(normalized_article)
 
-                # Save results to JSON file if save_results is True
+                # Save results to the article store if save_results is True
                 if save_results and normalized_articles:
-                    # Create Previous Searches directory if it doesn't exist
-                    save_dir = os.path.join(os.path.dirname(__file__), "Previous Searches")
-                    os.makedirs(save_dir, exist_ok=True)
-                    
-                    # Create filename with date and query terms
                     search_date = datetime.now().strftime("%Y-%m-%d")
-                    query_part = query_terms[:30] if query_terms else "general_ai_news" 
-                    query_part = "".join(c if c.isalnum() or c in "-_ " else "_" for c in query_part)  
-                    filename = f"{search_date}_{query_part}.json"
-                    
-                    # Save to JSON file
-                    file_path = os.path.join(save_dir, filename)
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        json.dump({
-                            "query": query,
-                            "search_date": search_date,
-                            "articles": normalized_articles
-                        }, f, indent=2, ensure_ascii=False)
-                    
-                    print(f"Search results saved to: {filename}")
+                    try:
+                        new_count = article_store.save_search(query, search_date, normalized_articles)
+                        print(f"Search results saved to the article store ({new_count} new articles)")
+                    except Exception as e:
+                        print(f"Error saving search results: {str(e)}")
                 
                 return normalized_articles
             else:
                 print(f"Error fetching news: {response.status_code}")
-                return []
+                raise NewsSourceUnavailable(f"News source unavailable (HTTP {response.status_code})")
+        except (NewsSourceUnavailable, DeadlineExceeded):
+            raise
+        except CircuitOpenError:
+            raise NewsSourceUnavailable("News source unavailable (circuit open), try again shortly") from None
+        except requests.RequestException as e:
+            print(f"Error fetching news: {str(e)}")
+            raise NewsSourceUnavailable(f"News source unavailable ({type(e).__name__})") from None
         except Exception as e:
             print(f"Error fetching news: {str(e)}")
             return []
@@ -109,7 +233,7 @@ class NewsSummarizerTools:
     """Tool for summarizing AI news articles."""
     
     def __init__(self):
-        self.client = OpenAI(api_key=config.OPENAI_API_KEY)
+        self.client = OpenAI(api_key=config.OPENAI_API_KEY, base_url=OPENAI_BASE_URL, max_retries=0)
         self.prompt_template = """
 Analyze this AI news article and provide:
 1. A concise 5-9 sentence summary highlighting key innovations and significance
@@ -127,21 +251,40 @@ IMPORTANCE: [1-10 score]
 KEY_POINTS: [comma-separated list of 3 specific key points]
 """
 
-    def summarize_article(self, article_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Summarizes a news article with importance rating and key points."""
+    def mark_unsummarized(self, article_data: Dict[str, Any], status: str, error: str) -> Dict[str, Any]:
+        """Show the article's description in place of a summary, with no rating."""
+        article_data.update(
+            summary=article_data.get("description") or "Summary unavailable.",
+            importance_score=0,
+            key_points=[],
+            status=status,
+            error=error
+        )
+        return article_data
+
+    def summarize_article(self, article_data: Dict[str, Any], deadline=None) -> Dict[str, Any]:
+        """Summarizes a news article with importance rating and key points.
+
+        The article is enriched in place and its page text is dropped once the
+        prompt is built; saved searches keep it in the article store. An
+        article not summarized before ``deadline`` is marked "timed_out".
+        """
         # Extract the basic fields
         title = article_data.get("title", "Untitled")
         description = article_data.get("description", "")
-        content = article_data.get("content", "")
+        content = article_data.pop("content", "")
+        
+        if deadline is not None and deadline.expired():
+            return self.mark_unsummarized(article_data, "timed_out", "Not summarized before the deadline")
         
         # If there's no text, return early
         if not (title or description or content):
-            return {
-                **article_data,
-                "summary": "No content available for summarization.",
-                "importance_score": 0,
-                "key_points": []
-            }
+            article_data.update(
+                summary="No content available for summarization.",
+                importance_score=0,
+                key_points=[]
+            )
+            return article_data
 
         # Create the prompt with the article content
         final_prompt = self.prompt_template.format(
@@ -152,7 +295,8 @@ KEY_POINTS: [comma-separated list of 3 specific key points]
 
         try:
             # Generate the summary using OpenAI
-            response = self.client.chat.completions.create(
+            response = openai_chat_completion(
+                self.client,
                 model="gpt-4o-mini",
                 messages=[
                     {
@@ -164,14 +308,15 @@ KEY_POINTS: [comma-separated list of 3 specific key points]
                         "content": final_prompt
                     }
                 ],
-                temperature=0.3
+                temperature=0.3,
+                deadline=deadline
             )
 
             result = response.choices[0].message.content.strip()
             
             # Parse the response
             summary_text = "Summary not generated."
-            importance_score = 5
+            importance_score = None
             key_points = []
             
             for line in result.split("\n"):
@@ -179,93 +324,78 @@ KEY_POINTS: [comma-separated list of 3 specific key points]
                 if line.startswith("SUMMARY:"):
                     summary_text = line[len("SUMMARY:"):].strip()
                 elif line.startswith("IMPORTANCE:"):
-                    try:
-                        importance_score = int(line[len("IMPORTANCE:"):].strip())
-                    except ValueError:
-                        importance_score = 5
+                    # Replies such as "8/10" or "**8**" still carry the score
+                    match = re.search(r"\d+", line[len("IMPORTANCE:"):])
+                    if match:
+                        importance_score = min(max(int(match.group()), 1), 10)
                 elif line.startswith("KEY_POINTS:"):
                     raw_points = line[len("KEY_POINTS:"):].strip()
                     key_points = [point.strip() for point in raw_points.split(",") if point.strip()]
 
-            # Return the result with original data preserved
-            return {
-                **article_data,
-                "summary": summary_text,
-                "importance_score": importance_score,
-                "key_points": key_points
-            }
+            if importance_score is None:
+                print(f"Error summarizing article: no importance score in the reply for {title!r}")
+                return self.mark_unsummarized(article_data, "degraded", "No importance score in the reply")
+
+            article_data.update(
+                summary=summary_text,
+                importance_score=importance_score,
+                key_points=key_points,
+                # Articles whose page was not extracted in time stay "description_only"
+                status=article_data.get("status", "ok")
+            )
+        except DeadlineExceeded as e:
+            self.mark_unsummarized(article_data, "timed_out", str(e))
         except Exception as e:
             print(f"Error summarizing article: {str(e)}")
-            return {
-                **article_data,
-                "summary": f"Summary unavailable due to an error: {str(e)}",
-                "importance_score": 5,
-                "key_points": []
-            }
+            # Marked as degraded instead of passing off a made-up rating
+            self.mark_unsummarized(article_data, "degraded", str(e))
+        return article_data
+
+    def batch_summarize_articles(self, articles: List[Dict[str, Any]], progress_callback=None, cancel_event=None,
+                                 tracker=None, deadline=None) -> List[Dict[str, Any]]:
+        """Summarize a batch of articles and return them with summaries.
 
-    def batch_summarize_articles(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Summarize a batch of articles and return them with summaries."""
-        return [self.summarize_article(article) for article in articles]
+        ``progress_callback(article, done, total)`` is called after each article.
+        If ``cancel_event`` is set, the articles summarized so far are returned.
+        Each summarized article is added to ``tracker`` (a TopicTracker) if given.
+        Once ``deadline`` has passed, the remaining articles are marked
+        "timed_out" without calling the API.
+        """
+        summarized = []
+        for article in articles:
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            summarized.append(self.summarize_article(article, deadline))
+            if tracker is not None:
+                tracker.add_article(summarized[-1])
+            if progress_callback:
+                progress_callback(summarized[-1], len(summarized), len(articles))
+        return summarized
 
 class NewsTrendAnalyzerTools:
-    def analyze_trends(self, articles: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Extract trends from the articles."""
+    def count_topics(self, articles: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Count weighted topic mentions from titles and key points."""
+        all_topics = {}
+        for article in articles:
+            for topic, weight in article_topic_weights(article).items():
+                all_topics[topic] = all_topics.get(topic, 0) + weight
+        return all_topics
+
+    def analyze_trends(self, articles: List[Dict[str, Any]], tracker=None) -> Dict[str, Any]:
+        """Extract trends from the articles.
+
+        Topics are read from ``tracker`` when the articles were already added
+        to one as they were summarized.
+        """
         if not articles:
             return {}
 
-        # Extract key points and title words
-        key_point_counts = {}
-        title_word_counts = {}
-        
-        # Words to exclude
-        stop_words = {
-            'and', 'the', 'to', 'of', 'in', 'for', 'with', 'on', 'at', 'from', 'by', 'about', 
-            'as', 'an', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 'how', 'what', 
-            'when', 'where', 'who', 'why', 'which', 'that', 'this', 'these', 'those'
-        }
-        
-        for article in articles:
-            # Process title words
-            if title := article.get("title"):
-                title_lower = ''.join(c if c.isalnum() or c.isspace() else ' ' for c in title.lower())
-                words = [w for w in title_lower.split() if len(w) > 3 and w not in stop_words]
-                
-                # Extract potential multi-word phrases (bigrams)
-                if len(words) > 1:
-                    for i in range(len(words) - 1):
-                        bigram = f"{words[i]} {words[i+1]}"
-                        title_word_counts[bigram] = title_word_counts.get(bigram, 0) + 1
-                
-                # Also count individual words
-                for word in words:
-                    title_word_counts[word] = title_word_counts.get(word, 0) + 1
-            
-            # Process key points
-            for point in article.get("key_points", []):
-                if isinstance(point, str):
-                    point_lower = point.lower().strip()
-                    
-                    if len(point_lower) > 3 and not any(c in point_lower for c in [',', ';']):
-                        key_point_counts[point_lower] = key_point_counts.get(point_lower, 0) + 2
-                    
-                    for term in point_lower.split(','):
-                        term = term.strip()
-                        if term and len(term) > 3 and term not in stop_words:
-                            key_point_counts[term] = key_point_counts.get(term, 0) + 1
-
-        # Combine key points and title words
-        all_topics = {}
-        all_topics.update(title_word_counts)
-        
-        for term, count in key_point_counts.items():
-            all_topics[term] = all_topics.get(term, 0) + count * 2
+        if tracker is None:
+            tracker = TopicTracker()
+            tracker.add_articles(articles)
         
         # Get top topics
-        trending_topics = sorted(
-            [(topic, count) for topic, count in all_topics.items()],
-            key=lambda x: x[1],
-            reverse=True
-        )[:10]
+        trending_topics = tracker.top_topics(10)
         
         # Deduplicate - remove topics that are substrings of others
         filtered_topics = []
@@ -283,7 +413,10 @@ class NewsTrendAnalyzerTools:
         top_articles = sorted(articles, key=lambda x: x.get("importance_score", 0), reverse=True)[:3]
 
         # Calculate average importance
-        importance_scores = [a.get("importance_score", 0) for a in articles if "importance_score" in a]
+        importance_scores = [
+            a.get("importance_score", 0) for a in articles
+            if "importance_score" in a and a.get("status") not in ("degraded", "timed_out")
+        ]
         avg_importance = sum(importance_scores) / len(importance_scores) if importance_scores else 0
 
         return {
@@ -297,35 +430,20 @@ class NewsTrendAnalyzerTools:
 
 class CombinedSummaryTools:
     def __init__(self):
-        self.client = OpenAI(api_key=config.OPENAI_API_KEY)
+        self.client = OpenAI(api_key=config.OPENAI_API_KEY, base_url=OPENAI_BASE_URL, max_retries=0)
         
-    def extract_trending_topics(self, articles: List[Dict[str, Any]]) -> List[str]:
+    def extract_trending_topics(self, articles: List[Dict[str, Any]], tracker=None) -> List[str]:
         """Extract the most common topics from the articles to guide the summary."""
-        topic_counts = {}
-        
-        for article in articles:
-            for point in article.get("key_points", []):
-                if isinstance(point, str):
-                    point = point.lower().strip()
-                    topic_counts[point] = topic_counts.get(point, 0) + 1
+        if tracker is None:
+            tracker = TopicTracker()
+            tracker.add_articles(articles)
         
-        top_topics = sorted(
-            [(topic, count) for topic, count in topic_counts.items()], 
-            key=lambda x: x[1], 
-            reverse=True
-        )[:8]
-        
-        return [topic for topic, _ in top_topics]
-        
-    def generate_combined_summary(self, articles: List[Dict[str, Any]]) -> str:
-        """Generate a comprehensive summary of all articles."""
-        if not articles:
-            return "No articles available to summarize."
-        
-        sorted_articles = sorted(articles, key=lambda x: x.get("importance_score", 0), reverse=True)
+        return [topic for topic, _ in tracker.top_key_points(8)]
         
+    def format_articles(self, articles: List[Dict[str, Any]]) -> str:
+        """Numbered article blocks for the summary prompts."""
         article_data = []
-        for idx, article in enumerate(sorted_articles[:15]):
+        for idx, article in enumerate(articles):
             title = article.get("title", "Untitled")
             summary = article.get("summary", "No summary available")
             importance = article.get("importance_score", 0)
@@ -337,9 +455,72 @@ class CombinedSummaryTools:
             
             article_data.append(article_info)
         
-        articles_text = "\n".join(article_data)
+        return "\n".join(article_data)
+    
+    def update_combined_summary(self, summary: str, new_articles: List[Dict[str, Any]], deadline=None):
+        """Fold a few new articles into an existing executive summary; None on failure."""
+        prompt = f"""
+Below is an executive summary of recent AI developments, followed by new articles published since it was written.
+
+EXECUTIVE SUMMARY:
+{summary}
+
+NEW ARTICLES:
+{self.format_articles(new_articles)}
+
+Revise the executive summary so it also covers the significant developments in the new articles. Keep everything in it that is still relevant, keep its style, and keep it a cohesive 3-4 paragraph summary without bullet points, numbered lists, or article references. Return only the revised summary.
+"""
+        try:
+            response = openai_chat_completion(
+                self.client,
+                model="gpt-4o-mini",
+                messages=[
+                    {"role": "system", "content": "You are an expert AI research analyst who specializes in identifying significant trends and developments in artificial intelligence."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.4,
+                max_tokens=800,
+                deadline=deadline
+            )
+            return response.choices[0].message.content.strip()
+        except Exception as e:
+            print(f"Error updating combined summary: {str(e)}")
+            return None
+    
+    def generate_combined_summary(self, articles: List[Dict[str, Any]], tracker=None, deadline=None) -> str:
+        """Generate a comprehensive summary of all articles.
+
+        Summaries are cached by the fingerprint of the top articles. When an
+        earlier set covers most of them, its summary is reused, or updated
+        with only the new high-importance articles. Trending key points come
+        from ``tracker`` if the articles were added to one.
+        """
+        if not articles:
+            return "No articles available to summarize."
+        
+        sorted_articles = sorted(articles, key=lambda x: x.get("importance_score", 0), reverse=True)
+        top_articles = sorted_articles[:15]
+        keys = [article_key(article) for article in top_articles]
+        
+        cached = summary_cache.get(set_fingerprint(keys))
+        if cached:
+            return cached
+        
+        cached_keys, cached_summary, overlap = summary_cache.closest(keys)
+        if cached_summary and overlap >= SUMMARY_REUSE_OVERLAP:
+            new_articles = [
+                article for article in top_articles
+                if article_key(article) not in cached_keys
+                and article.get("importance_score", 0) >= SUMMARY_DELTA_MIN_IMPORTANCE
+            ]
+            updated = self.update_combined_summary(cached_summary, new_articles, deadline) if new_articles else cached_summary
+            if updated:
+                summary_cache.store(keys, updated)
+                return updated
+        
+        articles_text = self.format_articles(top_articles)
         
-        trending_topics = self.extract_trending_topics(sorted_articles)
+        trending_topics = self.extract_trending_topics(sorted_articles, tracker)
         topics_text = ", ".join(trending_topics) if trending_topics else "No clear trending topics identified."
         
         prompt = f"""
@@ -367,19 +548,24 @@ Ensure the summary is informative, forward-looking, and valuable for someone wan
 """
 
         try:
-            response = self.client.chat.completions.create(
+            response = openai_chat_completion(
+                self.client,
                 model="gpt-4o-mini",
                 messages=[
                     {"role": "system", "content": "You are an expert AI research analyst who specializes in identifying significant trends and developments in artificial intelligence."},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.4,
-                max_tokens=800
+                max_tokens=800,
+                deadline=deadline
             )
             
             combined_summary = response.choices[0].message.content.strip()
+            summary_cache.store(keys, combined_summary)
             return combined_summary
             
+        except DeadlineExceeded:
+            return "The executive summary was not generated before the refresh deadline."
         except Exception as e:
             print(f"Error generating combined summary: {str(e)}")
             return "Unable to generate a combined summary at this time."
@@ -0,0 +1,196 @@
+"""Async HTTP API exposing the news pipeline as JSON.
+
+    python api_server.py --port 8080
+
+    GET /news?query=...&days=7&article_count=10&sources=a.com,b.com&min_importance=5&deadline=30
+    GET /trends?...           trends and executive summary only
+    GET /trends?scope=history topics tracked across refreshes
+    GET /graph?...            knowledge graph for the result (node-link JSON)
+    GET /graph?scope=history  knowledge graph kept across refreshes
+    GET /health
+
+Identical concurrent requests share one pipeline run through the shared
+result cache. Responses carry an ETag and honour If-None-Match, and are
+gzip-compressed when the client accepts it. For local load tests, run
+mock_backends.py and point config.py at it.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from aiohttp import web
+from article_record import json_default
+from crew_workflow import get_summarized_news
+from knowledge_graph import build_knowledge_graph
+from graph_store import graph_store
+from topic_tracker import topic_tracker
+from result_cache import shared_results, make_key
+
+# Pipeline runs block on HTTP and LLM calls, so they run on worker threads
+pipeline_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="pipeline")
+
+class EncodedBodies:
+    """Serialized response bodies, reused while their source is unchanged."""
+
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, version, build):
+        """Return (body, etag) for ``build()``, encoding at most once per version.
+
+        ``version`` is any comparable token, such as the id of a cached result
+        object (kept alive by ``build``) or a file modification time.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == version:
+                return entry[2], entry[3]
+
+        body = json.dumps(build(), ensure_ascii=False, default=json_default).encode("utf-8")
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self.max_entries:
+                self._entries.pop(next(iter(self._entries)))
+            # The builder is kept so the object behind an id() version stays alive
+            self._entries[key] = (version, build, body, etag)
+        return body, etag
+
+encoded_bodies = EncodedBodies()
+
+def int_param(request, name, default=None):
+    """A non-negative integer query parameter; anything else is a 400."""
+    if name not in request.query:
+        return default
+    try:
+        value = int(request.query[name])
+    except ValueError:
+        value = -1
+    if value < 0:
+        raise web.HTTPBadRequest(text=f"{name} must be a non-negative integer")
+    return value
+
+def request_params(request):
+    """Pipeline parameters from the query string."""
+    sources = request.query.get("sources")
+    try:
+        deadline = float(request.query["deadline"]) if "deadline" in request.query else None
+    except ValueError:
+        deadline = -1
+    if deadline is not None and not (math.isfinite(deadline) and deadline >= 0):
+        raise web.HTTPBadRequest(text="deadline must be a non-negative number")
+    return {
+        "query_terms": request.query.get("query") or None,
+        "days": int_param(request, "days", 7),
+        "article_count": int_param(request, "article_count", 10),
+        "preferred_sources": [s.strip() for s in sources.split(",") if s.strip()] if sources else None,
+        "min_importance": int_param(request, "min_importance"),
+        "deadline": deadline,
+    }
+
+async def pipeline_result(params):
+    """Get the (possibly shared) pipeline result without blocking the event loop."""
+    key = make_key(**params)
+    cached = shared_results.get(key)
+    if cached is not None:
+        return key, cached
+    loop = asyncio.get_running_loop()
+    result = await loop.run_in_executor(
+        pipeline_pool,
+        lambda: shared_results.run(
+            key,
+            lambda progress_callback, cancel_event: get_summarized_news(
+                **params,
+                progress_callback=progress_callback,
+                cancel_event=cancel_event
+            )
+        )
+    )
+    return key, result
+
+def json_response(request, body, etag, status=200):
+    """Build a conditional, compressible JSON response."""
+    if etag in request.headers.get("If-None-Match", ""):
+        return web.Response(status=304, headers={"ETag": etag})
+    response = web.Response(body=body, status=status, content_type="application/json", headers={"ETag": etag})
+    response.enable_compression()
+    return response
+
+def graph_json(G):
+    """Node-link JSON for a knowledge graph."""
+    return {
+        "nodes": [{"id": node, **attrs} for node, attrs in G.nodes(data=True)],
+        "edges": [{"source": source, "target": target, **attrs} for source, target, attrs in G.edges(data=True)],
+    }
+
+def result_status(result):
+    """HTTP status for a pipeline result."""
+    if result.get("source_unavailable"):
+        return 503
+    return 502 if result.get("error") and not result.get("articles") else 200
+
+async def handle_news(request):
+    key, result = await pipeline_result(request_params(request))
+    body, etag = encoded_bodies.get(("news", key), id(result), lambda: result)
+    return json_response(request, body, etag, status=result_status(result))
+
+async def handle_trends(request):
+    if request.query.get("scope") == "history":
+        limit = int_param(request, "limit", 10)
+        body, etag = encoded_bodies.get(("trends", "history", limit), topic_tracker.refresh(), lambda: {
+            "trending_topics": [{"topic": topic, "score": round(score, 2)} for topic, score in topic_tracker.top_topics(limit)],
+            "key_points": [{"topic": point, "score": round(score, 2)} for point, score in topic_tracker.top_key_points(limit)],
+            "articles_seen": topic_tracker.articles_seen,
+        })
+        return json_response(request, body, etag)
+
+    key, result = await pipeline_result(request_params(request))
+    body, etag = encoded_bodies.get(("trends", key), id(result), lambda: {
+        "trends": result.get("trends", {}),
+        "combined_summary": result.get("combined_summary", ""),
+        "total_articles": result.get("total_articles", 0),
+        "error": result.get("error"),
+    })
+    return json_response(request, body, etag, status=result_status(result))
+
+async def handle_graph(request):
+    if request.query.get("scope") == "history":
+        # Versioned by modification time so the store is only re-read when it changes
+        max_nodes = int_param(request, "max_nodes", 150)
+        loop = asyncio.get_running_loop()
+        body, etag = await loop.run_in_executor(pipeline_pool, lambda: encoded_bodies.get(
+            ("graph", "history", max_nodes),
+            graph_store.last_modified(),
+            lambda: graph_json(graph_store.load(max_nodes=max_nodes))
+        ))
+        return json_response(request, body, etag)
+
+    key, result = await pipeline_result(request_params(request))
+    body, etag = encoded_bodies.get(("graph", key), id(result), lambda: graph_json(
+        build_knowledge_graph(result.get("articles", []), result.get("trends", {}))
+    ))
+    return json_response(request, body, etag, status=result_status(result))
+
+async def handle_health(request):
+    return web.json_response({"status": "ok"})
+
+def make_app():
+    app = web.Application()
+    app.add_routes([
+        web.get("/news", handle_news),
+        web.get("/trends", handle_trends),
+        web.get("/graph", handle_graph),
+        web.get("/health", handle_health),
+    ])
+    return app
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the AI news pipeline as a JSON API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+    web.run_app(make_app(), host=args.host, port=args.port)
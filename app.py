@@ -1,14 +1,31 @@
 import streamlit as st
 import sys
 import os
+import time
 from datetime import datetime
+from html import escape
 import pandas as pd
 import json
 
 # Import your workflow function
 sys.path.append(os.path.abspath(os.path.dirname(__file__)))
-from crew_workflow import get_summarized_news
+from refresh_job import RefreshJob
+from result_cache import shared_results
 from knowledge_graph import display_knowledge_graph
+from trend_history import trend_history, WINDOWS
+from quick_filters import QUICK_FILTERS, union_query
+from agents import NewsTrendAnalyzerTools
+import profiling
+from profiling import profiled
+import config
+
+# Opt-in: fetch the union of all quick filters once and route articles to them
+# locally, so switching filters needs no new API calls (at a larger first fetch)
+QUICK_FILTER_UNION = getattr(config, "QUICK_FILTER_UNION", False)
+# Articles fetched for the union, per article requested for one filter
+QUICK_FILTER_FETCH_FACTOR = getattr(config, "QUICK_FILTER_FETCH_FACTOR", 3)
+# Optional time budget of one refresh; what is not done by then is shown unsummarized
+REFRESH_DEADLINE_SECONDS = getattr(config, "REFRESH_DEADLINE_SECONDS", None)
 
 # Page configuration
 st.set_page_config(
@@ -123,6 +140,24 @@ st.markdown("""
         margin: 0.3rem;
     }
     
+    .article-related {
+        font-size: 0.85rem;
+        color: #5e6e82;
+        margin-bottom: 0.5rem;
+    }
+    
+    .article-related ul {
+        margin: 0.25rem 0 0 1rem;
+    }
+    
+    .degraded-badge {
+        background-color: #FEF3C7;
+        color: #92400E;
+        padding: 0.15rem 0.5rem;
+        border-radius: 0.25rem;
+        margin-left: auto;
+    }
+    
     .read-article-button {
         background-color: #ffffff;
         color: white;
@@ -165,120 +200,123 @@ st.markdown("""
     </div>
 """, unsafe_allow_html=True)
 
-# Initialize session state
-if 'news_data' not in st.session_state:
-    st.session_state.news_data = None
-    
-if 'selected_sources' not in st.session_state:
-    st.session_state.selected_sources = []
+# Render units
+# Each section is its own function so that widgets only rerun the part of the
+# page they affect: source and importance filters live in the article list
+# fragment, the momentum window and graph scope in their own fragments, and
+# the static sections are built from cached HTML.
 
-# Sidebar with simplified controls
-with st.sidebar:
-    st.header("Search & Filters")
-    
-    # Quick filters section
-    st.subheader("Quick Filters")
-    
-    quick_filter = st.radio(
-        "Topic",
-        ["All AI News", "Generative AI", "AI Ethics", "Research Breakthroughs", "Business Applications"]
+def format_render_time(started):
+    """Milliseconds elapsed since ``started`` (a perf_counter value)."""
+    return (time.perf_counter() - started) * 1000
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def trending_topics_html(trending_topics):
+    """Build the trending topic tag cloud as a single HTML block."""
+    tags = "".join(f"<span class='trend-tag'>{topic}</span>" for topic in trending_topics)
+    return f"<div style='text-align:center;padding:1rem;'>{tags}</div>"
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def executive_summary_html(combined_summary):
+    """Build the executive summary box as a single HTML block."""
+    return """
+        <div style="background-color: #f8f9fa; padding: 1.5rem; border-radius: 8px; border-left: 4px solid #3a86ff; margin-bottom: 2rem;">
+            <p style="font-size: 1.05rem; line-height: 1.6; color: #333; font-style: normal;">
+        """ + combined_summary.replace("\n", "<br>") + """
+            </p>
+        </div>
+        """
+
+PAGE_SIZES = [10, 20, 50]
+
+trend_tools = NewsTrendAnalyzerTools()
+
+def quick_filter_view(articles, quick_filter, limit):
+    """The top articles routed to ``quick_filter``, with trends computed locally."""
+    selected = [article for article in articles if quick_filter in (article.get("quick_filters") or ())]
+    selected.sort(key=lambda x: (x.get("status") != "deferred", x.get("importance_score", 0)), reverse=True)
+    selected = selected[:limit]
+    return selected, trend_tools.analyze_trends(selected)
+
+def format_published_date(published_date):
+    """Format an ISO publish date for display."""
+    try:
+        if published_date:
+            parsed_date = datetime.strptime(published_date.split('T')[0], '%Y-%m-%d')
+            return parsed_date.strftime('%b %d, %Y')
+        return "Unknown Date"
+    except Exception:
+        return published_date
+
+@st.cache_data(show_spinner=False, max_entries=2000)
+def article_card_html(title, source_name, published_date, importance, summary, key_points, related, url, badge=None):
+    """Build one article card as a single HTML block.
+
+    Arguments are the displayed fields only (lists as tuples), so the cache
+    key stays small and never includes the article's full text.
+    """
+    tags = "".join(
+        f'<span class="tag">{escape(point.strip())}</span>'
+        for point in key_points if point.strip()
     )
-    
-    # Generate search terms based on selected quick filter
-    if quick_filter == "All AI News":
-        default_query = "Artificial Intelligence OR AI OR machine learning OR LLM"
-    elif quick_filter == "Generative AI":
-        default_query = "Generative AI OR LLM OR GPT OR diffusion model"
-    elif quick_filter == "AI Ethics":
-        default_query = "AI ethics OR AI bias OR AI regulation OR responsible AI"
-    elif quick_filter == "Research Breakthroughs":
-        default_query = "AI research breakthrough OR new AI model OR AI paper"
-    else:  
-        default_query = "AI business application OR enterprise AI OR AI startup"
-    
-    # Define query based on the quick filter without showing the text_area
-    query = default_query 
-    
-    col1, col2 = st.columns(2)
-    with col1:
-        days = st.slider(
-            "Days",
-            min_value=1,
-            max_value=30,
-            value=7
+    parts = [
+        '<div class="card">',
+        f'<div class="article-title">{escape(title)}</div>',
+        '<div class="article-meta">',
+        f'<span class="source-badge">{escape(source_name)}</span>',
+        f'<span>📅 {escape(format_published_date(published_date))}</span>',
+        # Degraded and deferred articles were never rated, so no score is shown for them
+        f'<span class="degraded-badge">{escape(badge)}</span>' if badge
+        else f'<span style="margin-left: auto;">Importance: {importance}/10</span>',
+        '</div>',
+        f'<div class="article-summary">{escape(summary)}</div>',
+    ]
+    if tags:
+        parts.append(f'<div class="tags-container">{tags}</div>')
+    
+    # Earlier coverage found in the local article index
+    if related:
+        related_links = "".join(
+            f'<li><a href="{escape(match_url)}" target="_blank">{escape(match_title)}</a></li>'
+            for match_title, match_url in related
         )
+        parts.append(f'<div class="article-related">Related earlier coverage:<ul>{related_links}</ul></div>')
     
-    with col2:
-        article_count = st.slider(
-            "Articles",
-            min_value=5,
-            max_value=30,
-            value=10
+    # Link to full article
+    if url:
+        parts.append(
+            f'<a href="{escape(url)}" target="_blank" class="read-article-button">'
+            '<span style="margin-right: 5px;">📄</span> Read Full Article</a>'
         )
-    
-    # Display options
-    st.subheader("Display Options")
-    min_importance = st.slider("Minimum Importance", 1, 10, 1)
-    
-    # Fetch button
-    fetch_pressed = st.button("🔄 Refresh News", type="primary", use_container_width=True)
-    
-    if st.button("🗑️ Clear Cache", use_container_width=True):
-        st.session_state.news_data = None
-        st.toast("Cache cleared successfully!")
-    
-    # About section
-    with st.expander("About This App"):
-        st.markdown("""
-        This application uses AI to analyze the latest news in artificial intelligence:
-        
-        1. **Finding** relevant AI news articles
-        2. **Summarizing** content to key points
-        3. **Rating** articles by importance
-        4. **Identifying** emerging trends
-        
-        Built with Streamlit and OpenAI.
-        """)
+    parts.append('</div>')
+    return "".join(parts)
 
-# Fetch data if button is pressed or if there's nothing in session state yet
-if fetch_pressed or st.session_state.news_data is None:
-    with st.spinner("Gathering the latest AI insights..."):
-        try:
-            st.session_state.news_data = get_summarized_news(
-                query_terms=query,
-                days=days,
-                article_count=article_count,
-                preferred_sources=None
-            )
-            st.session_state.selected_sources = []
-            st.success("Successfully retrieved AI news!")
-        except Exception as e:
-            st.error(f"Error retrieving news: {str(e)}")
-            if st.session_state.news_data is None:
-                st.session_state.news_data = {"articles": [], "trends": {}, "error": str(e)}
+def article_badge(article):
+    """Badge shown instead of the importance score for unrated articles."""
+    if article.get("status") == "degraded":
+        return "⚠ Not summarized"
+    if article.get("status") == "timed_out":
+        return "⏱ Not summarized in time"
+    if article.get("status") == "deferred":
+        return f"Not summarized · predicted {article['predicted_importance']:.0f}/10"
+    return None
 
-# Content area
-if st.session_state.news_data:
-    news_data = st.session_state.news_data
-    articles = news_data.get("articles", [])
-    trends = news_data.get("trends", {})
-    
-    # Error handling
-    if "error" in news_data and news_data["error"]:
-        st.error(f"Error fetching news: {news_data['error']}")
-        st.info("Try adjusting your search terms or time range.")
-    
-    # Collect all unique sources
-    all_sources = set()
-    
-    for article in articles:
-        s_name = article.get("source", {}).get("name", "").strip()
-        if s_name:
-            all_sources.add(s_name)
-    
-    all_sources = sorted(list(all_sources))
-    
-    # Overview metrics
+def article_html(article):
+    """Cached card HTML for an article."""
+    return article_card_html(
+        article.get('title', 'Untitled'),
+        article.get('source', {}).get('name', 'Unknown'),
+        article.get('publishedAt', ''),
+        article.get("importance_score", 0),
+        article.get("summary", article.get("description") or "No summary available"),
+        tuple(point for point in article.get("key_points", []) if isinstance(point, str)),
+        tuple((match["title"], match["url"]) for match in article.get("related_articles", [])),
+        article.get("url", ""),
+        article_badge(article)
+    )
+
+def render_overview(articles, trends, days):
+    """Overview metrics."""
     st.header("📊 Overview")
     
     cols = st.columns(4)
@@ -286,8 +324,7 @@ if st.session_state.news_data:
         st.metric("Articles Found", len(articles))
     
     with cols[1]:
-        trending_topics = trends.get("trending_topics", [])
-        st.metric("Trending Topics", len(trending_topics))
+        st.metric("Trending Topics", len(trends.get("trending_topics", [])))
     
     with cols[2]:
         avg_importance = trends.get('average_importance', 0)
@@ -295,32 +332,67 @@ if st.session_state.news_data:
     
     with cols[3]:
         st.metric("Days Searched", days)
-    
-    # Trending Topics section
+
+def render_trending_topics(trending_topics):
+    """Trending topic tag cloud."""
     st.header("🔥 Trending Topics")
     
     if trending_topics:
-        # Create a tag cloud
-        st.markdown("<div style='text-align:center;padding:1rem;'>", unsafe_allow_html=True)
-        for topic in trending_topics:
-            st.markdown(f"<span class='trend-tag'>{topic}</span>", unsafe_allow_html=True)
-        st.markdown("</div>", unsafe_allow_html=True)
+        st.markdown(trending_topics_html(tuple(trending_topics)), unsafe_allow_html=True)
     else:
         st.info("No trending topics identified from the current articles.")
-        
-    # Combined summary section
+
+@st.fragment
+def render_topic_momentum():
+    """Topic momentum over the saved search archive; the window radio reruns only this section."""
+    st.header("📈 Topic Momentum")
+    window_days = st.radio(
+        "Window",
+        WINDOWS,
+        format_func=lambda d: f"{d} days",
+        horizontal=True
+    )
+    trend_history.update()
+    momentum = trend_history.topic_momentum(window_days)
+    
+    if momentum["rising"] or momentum["falling"]:
+        rising_col, falling_col = st.columns(2)
+        with rising_col:
+            st.subheader("Rising")
+            for topic, current, previous in momentum["rising"]:
+                st.markdown(f"<span class='trend-tag'>▲ {topic}</span> {previous} → {current}", unsafe_allow_html=True)
+        with falling_col:
+            st.subheader("Falling")
+            for topic, current, previous in momentum["falling"]:
+                st.markdown(f"<span class='trend-tag'>▼ {topic}</span> {previous} → {current}", unsafe_allow_html=True)
+    else:
+        st.info("Not enough saved searches yet to compare topics over time.")
+
+def render_executive_summary(combined_summary):
+    """Executive summary box."""
     st.header("📝 Executive Summary")
-    combined_summary = news_data.get("combined_summary", "")
     if combined_summary:
-        st.markdown("""
-        <div style="background-color: #f8f9fa; padding: 1.5rem; border-radius: 8px; border-left: 4px solid #3a86ff; margin-bottom: 2rem;">
-            <p style="font-size: 1.05rem; line-height: 1.6; color: #333; font-style: normal;">
-        """ + combined_summary.replace("\n", "<br>") + """
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(executive_summary_html(combined_summary), unsafe_allow_html=True)
     else:
         st.info("No executive summary available. Try refreshing the news.")
+
+@st.fragment
+def render_article_list(articles):
+    """Source and importance filters with the article list.
+
+    Filter interactions rerun only this fragment, not the rest of the page.
+    """
+    started = time.perf_counter()
+    
+    # Collect all unique sources
+    all_sources = set()
+    
+    for article in articles:
+        s_name = article.get("source", {}).get("name", "").strip()
+        if s_name:
+            all_sources.add(s_name)
+    
+    all_sources = sorted(list(all_sources))
     
     # Source filtering
     if all_sources:
@@ -344,6 +416,9 @@ if st.session_state.news_data:
                     if source in st.session_state.selected_sources:
                         st.session_state.selected_sources.remove(source)
     
+    # Display options
+    min_importance = st.slider("Minimum Importance", 1, 10, 1, key="min_importance")
+    
     # Filter the articles
     filtered_articles = articles
     
@@ -354,83 +429,288 @@ if st.session_state.news_data:
             if art.get("source", {}).get("name") in st.session_state.selected_sources
         ]
     
-    # Filter by minimum importance score
+    # Filter by minimum importance score; degraded and timed out articles stay
+    # visible and deferred ones are compared by their predicted score
     filtered_articles = [
         art for art in filtered_articles
-        if art.get("importance_score", 0) >= min_importance
+        if art.get("importance_score", art.get("predicted_importance", 0)) >= min_importance
+        or art.get("status") in ("degraded", "timed_out")
     ]
     
     # Main articles section
     st.header("📰 Latest AI News")
     
     if filtered_articles:
-        # Sort articles by importance score (highest first)
-        filtered_articles.sort(key=lambda x: x.get("importance_score", 0), reverse=True)
+        # Sort articles by importance score (highest first), deferred ones last
+        filtered_articles.sort(key=lambda x: (x.get("status") != "deferred", x.get("importance_score", 0)), reverse=True)
         
-        # Articles view
-        for article in filtered_articles:
-            importance = article.get("importance_score", 0)
-            
-            # Format the date
-            published_date = article.get('publishedAt', '')
-            try:
-                if published_date:
-                    parsed_date = datetime.strptime(published_date.split('T')[0], '%Y-%m-%d')
-                    formatted_date = parsed_date.strftime('%b %d, %Y')
-                else:
-                    formatted_date = "Unknown Date"
-            except Exception:
-                formatted_date = published_date
-            
-            # Article card
-            st.markdown('<div class="card">', unsafe_allow_html=True)
-            
-            # Title and metadata
-            st.markdown(f"""
-            <div class="article-title">{article.get('title', 'Untitled')}</div>
-            <div class="article-meta">
-                <span class="source-badge">{article.get('source', {}).get('name', 'Unknown')}</span>
-                <span>📅 {formatted_date}</span>
-                <span style="margin-left: auto;">Importance: {importance}/10</span>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Display article summary
-            st.markdown(f'<div class="article-summary">{article.get("summary", "No summary available")}</div>', unsafe_allow_html=True)
-            
-            # Key points as tags
-            key_points = article.get("key_points", [])
-            if key_points:
-                st.markdown('<div class="tags-container">', unsafe_allow_html=True)
-                for point in key_points:
-                    if isinstance(point, str) and point.strip():
-                        st.markdown(f'<span class="tag">{point.strip()}</span>', unsafe_allow_html=True)
-                st.markdown('</div>', unsafe_allow_html=True)
-            
-            # Link to full article
-            url = article.get("url", "")
-            if url:
-                st.markdown(f'''
-                    <a href="{url}" target="_blank" class="read-article-button">
-                        <span style="margin-right: 5px;">📄</span> Read Full Article
-                    </a>''', unsafe_allow_html=True)
-            
-            st.markdown('</div>', unsafe_allow_html=True)
+        # Pagination
+        page_col, size_col = st.columns([3, 1])
+        with size_col:
+            page_size = st.selectbox("Per page", PAGE_SIZES, index=0, key="page_size")
+        page_count = (len(filtered_articles) - 1) // page_size + 1
+        if st.session_state.get("article_page", 1) > page_count:
+            # Filters shrank the list below the current page
+            st.session_state.article_page = page_count
+        with page_col:
+            page = st.number_input("Page", min_value=1, max_value=page_count, step=1, key="article_page") if page_count > 1 else 1
+        
+        first = (page - 1) * page_size
+        page_articles = filtered_articles[first:first + page_size]
+        st.caption(f"Showing {first + 1}–{first + len(page_articles)} of {len(filtered_articles)} articles")
+        
+        # Render the whole page as one HTML block from cached cards
+        st.markdown("".join(article_html(article) for article in page_articles), unsafe_allow_html=True)
     else:
         if st.session_state.selected_sources:
             st.warning("No articles match your selected sources. Try adjusting your filters.")
         else:
             st.warning("No articles found matching your search criteria. Try broadening your search terms.")
+    
+    st.caption(f"Article list rendered in {format_render_time(started):.0f} ms")
+
+@st.fragment
+def render_diagnostics():
+    """Hotspots of recent profiled runs; picking a run reruns only this section."""
+    st.header("🩺 Diagnostics")
+    runs = list(reversed(profiling.recent_runs))
+    if not runs:
+        st.info("No profiled runs yet. Refresh the news to record one.")
+        return
+    
+    index = st.selectbox(
+        "Profiled run",
+        range(len(runs)),
+        format_func=lambda i: f"{runs[i]['name']} · {runs[i]['started']} · {runs[i]['wall_ms']:.0f} ms"
+    )
+    run = runs[index]
+    
+    cols = st.columns(3)
+    cols[0].metric("Wall time", f"{run['wall_ms']:.0f} ms")
+    cols[1].metric(
+        "Peak traced memory",
+        f"{run['peak_kib'] / 1024:.1f} MiB" if run["peak_kib"] is not None else "n/a",
+        help="Only measured for runs that did not overlap another profiled run"
+    )
+    cols[2].metric("Stack samples", run["samples"])
+    
+    st.subheader("CPU hotspots (self time)")
+    st.dataframe(pd.DataFrame(run["cpu_hotspots"]), hide_index=True, use_container_width=True)
+    st.subheader("Allocation hotspots (memory still held at the end)")
+    if run["allocation_hotspots"]:
+        st.dataframe(pd.DataFrame(run["allocation_hotspots"]), hide_index=True, use_container_width=True)
+    else:
+        st.caption("No memory left allocated by this run.")
+    st.caption(f"Full profile, folded stacks for flamegraphs and allocation tracebacks: {run['path']}")
+
+@st.fragment(run_every=1)
+def render_refresh_progress():
+    """Live progress of the background refresh, with articles shown as they are summarized."""
+    job = st.session_state.refresh_job
+    if job is None:
+        return
+    
+    if job.finished:
+        # Swap in the complete result and rerun the whole page once
+        st.session_state.refresh_job = None
+        st.session_state.news_data = job.result
+        # The cache entry behind what is shown, for Clear Cache
+        st.session_state.news_key = job.key
+        st.session_state.selected_sources = []
+        if not job.result.get("error"):
+            st.toast("Successfully retrieved AI news!")
+        st.rerun()
+    
+    stage, done, total, partial_articles = job.snapshot()
+    progress_col, cancel_col = st.columns([4, 1])
+    with progress_col:
+        label = f"{stage}… {done}/{total} articles" if total else f"{stage}…"
+        st.progress(done / total if total else 0.0, text=label)
+    with cancel_col:
+        if st.button("✖ Cancel", use_container_width=True):
+            job.cancel()
+            st.session_state.refresh_job = None
+            # Keep the page from starting a new refresh straight away
+            st.session_state.refresh_cancelled = True
+            st.rerun()
+    
+    if partial_articles:
+        st.markdown("".join(article_html(article) for article in partial_articles), unsafe_allow_html=True)
 
-    # Knowledge Graph section
+@st.fragment
+def render_knowledge_graph(articles, trends):
+    """Knowledge graph section; the scope radio reruns only this section."""
     if articles:  
         display_knowledge_graph(articles, trends)
     else:
         st.info("No articles available for knowledge graph visualization. Try refreshing the news.")
 
+run_started = time.perf_counter()
+
+# Initialize session state
+if 'news_data' not in st.session_state:
+    st.session_state.news_data = None
+    
+if 'selected_sources' not in st.session_state:
+    st.session_state.selected_sources = []
+
+if 'refresh_job' not in st.session_state:
+    st.session_state.refresh_job = None
+
+if 'news_key' not in st.session_state:
+    st.session_state.news_key = None
+
+if 'refresh_cancelled' not in st.session_state:
+    st.session_state.refresh_cancelled = False
+
+# Sidebar with simplified controls
+with st.sidebar:
+    st.header("Search & Filters")
+    
+    # Quick filters section
+    st.subheader("Quick Filters")
+    
+    quick_filter = st.radio(
+        "Topic",
+        list(QUICK_FILTERS)
+    )
+    
+    # Define query based on the quick filter without showing the text_area
+    query = QUICK_FILTERS[quick_filter]
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        days = st.slider(
+            "Days",
+            min_value=1,
+            max_value=30,
+            value=7
+        )
+    
+    with col2:
+        article_count = st.slider(
+            "Articles",
+            min_value=5,
+            max_value=30,
+            value=10
+        )
+    
+    if QUICK_FILTER_UNION:
+        # One refresh serves every quick filter; the radio only picks what is shown
+        refresh_params = dict(
+            query_terms=union_query(QUICK_FILTERS.values()),
+            days=days,
+            article_count=min(article_count * QUICK_FILTER_FETCH_FACTOR, 100),
+            route_filters=QUICK_FILTERS,
+            min_importance=st.session_state.get("min_importance")
+        )
+    else:
+        refresh_params = dict(
+            query_terms=query,
+            days=days,
+            article_count=article_count,
+            min_importance=st.session_state.get("min_importance")
+        )
+    
+    # Fetch button
+    fetch_pressed = st.button("🔄 Refresh News", type="primary", use_container_width=True)
+    
+    if st.button("🗑️ Clear Cache", use_container_width=True):
+        # The sidebar may have changed since the last refresh, so drop the entries actually in use
+        if st.session_state.news_key is not None:
+            shared_results.invalidate(st.session_state.news_key)
+        if st.session_state.refresh_job is not None:
+            shared_results.invalidate(st.session_state.refresh_job.key)
+        st.session_state.news_key = None
+        st.session_state.news_data = None
+        st.session_state.refresh_cancelled = False
+        st.toast("Cache cleared successfully!")
+    
+    # About section
+    with st.expander("About This App"):
+        st.markdown("""
+        This application uses AI to analyze the latest news in artificial intelligence:
+        
+        1. **Finding** relevant AI news articles
+        2. **Summarizing** content to key points
+        3. **Rating** articles by importance
+        4. **Identifying** emerging trends
+        
+        Built with Streamlit and OpenAI.
+        """)
+
+# Start a background refresh if button is pressed or if there's nothing in session state yet,
+# unless the user cancelled the last one
+if fetch_pressed or (st.session_state.news_data is None and st.session_state.refresh_job is None
+                     and not st.session_state.refresh_cancelled):
+    st.session_state.refresh_cancelled = False
+    # A newer refresh supersedes one that is still running
+    if st.session_state.refresh_job is not None:
+        st.session_state.refresh_job.cancel()
+    # Articles predicted well below the importance filter skip the LLM call
+    st.session_state.refresh_job = RefreshJob(
+        **refresh_params,
+        preferred_sources=None,
+        save_results=True,
+        deadline=REFRESH_DEADLINE_SECONDS
+    ).start()
+
+if st.session_state.refresh_job is not None:
+    render_refresh_progress()
+elif st.session_state.refresh_cancelled and not st.session_state.news_data:
+    st.info("Refresh cancelled. Press Refresh News to load articles.")
+
+# Content area
+with profiled("app_render"):
+    if st.session_state.news_data:
+        news_data = st.session_state.news_data
+        articles = news_data.get("articles", [])
+        trends = news_data.get("trends", {})
+        if QUICK_FILTER_UNION:
+            articles, trends = quick_filter_view(articles, quick_filter, article_count)
+    
+        # Error handling
+        if "error" in news_data and news_data["error"]:
+            st.error(f"Error fetching news: {news_data['error']}")
+            if news_data.get("source_unavailable"):
+                st.info("The news source could not be reached. Refresh again in a minute.")
+            else:
+                st.info("Try adjusting your search terms or time range.")
+    
+        if news_data.get("degraded_articles"):
+            st.warning(
+                f"{news_data['degraded_articles']} article(s) could not be summarized and are shown with "
+                "their original description. Refresh later to retry."
+            )
+        if news_data.get("timed_out"):
+            st.warning(
+                "The refresh reached its time limit: "
+                f"{news_data.get('timed_out_articles', 0)} article(s) were not summarized and "
+                f"{news_data.get('description_only_articles', 0)} were summarized from their description only. "
+                "Refresh again to complete them."
+            )
+        if news_data.get("deferred_articles"):
+            st.caption(
+                f"{news_data['deferred_articles']} article(s) predicted below the importance filter "
+                "were not summarized."
+            )
+    
+        render_overview(articles, trends, days)
+        render_trending_topics(trends.get("trending_topics", []))
+        render_topic_momentum()
+        render_executive_summary(news_data.get("combined_summary", ""))
+        if QUICK_FILTER_UNION:
+            st.caption("The executive summary covers the articles of every quick filter.")
+        render_article_list(articles)
+        render_knowledge_graph(articles, trends)
+
+
+if profiling.enabled:
+    render_diagnostics()
+
 # Footer
 st.markdown(f"""
     <div style="text-align:center; margin-top:2rem; font-size:0.8rem; color:#666;">
-        Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+        Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} · Page rendered in {format_render_time(run_started):.0f} ms
     </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+""", unsafe_allow_html=True)
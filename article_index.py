@@ -0,0 +1,206 @@
+import os
+import re
+import json
+import math
+import zlib
+import threading
+import numpy as np
+from typing import List, Dict, Any
+from file_lock import FileLock
+
+# Default location, next to the saved searches
+DEFAULT_INDEX_DIR = os.path.join(os.path.dirname(__file__), "Previous Searches", "article_index")
+
+STOP_WORDS = {
+    'and', 'the', 'to', 'of', 'in', 'for', 'with', 'on', 'at', 'from', 'by', 'about',
+    'as', 'an', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 'how', 'what',
+    'when', 'where', 'who', 'why', 'which', 'that', 'this', 'these', 'those', 'its',
+    'has', 'have', 'had', 'will', 'can', 'not', 'but', 'their', 'they', 'into', 'more'
+}
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stop words, plus adjacent bigrams."""
+    words = [w for w in TOKEN_PATTERN.findall(text.lower()) if len(w) > 2 and w not in STOP_WORDS]
+    return words + [f"{words[i]} {words[i+1]}" for i in range(len(words) - 1)]
+
+def hash_features(text: str, dim: int) -> np.ndarray:
+    """Turn text into an L2-normalised signed hashed term-frequency vector."""
+    counts = {}
+    for token in tokenize(text):
+        h = zlib.crc32(token.encode("utf-8"))
+        counts[h] = counts.get(h, 0) + 1
+
+    vector = np.zeros(dim, dtype=np.float32)
+    for h, count in counts.items():
+        # The top bit picks the sign so colliding features tend to cancel out
+        sign = -1.0 if h & 0x80000000 else 1.0
+        vector[h % dim] += sign * (1.0 + math.log(count))
+
+    norm = np.linalg.norm(vector)
+    if norm > 0:
+        vector /= norm
+    return vector
+
+def article_text(article: Dict[str, Any]) -> str:
+    """The text of an enriched article that is indexed."""
+    parts = [article.get("title", ""), article.get("summary", "")]
+    parts.extend(point for point in article.get("key_points", []) if isinstance(point, str))
+    return "\n".join(part for part in parts if part)
+
+class ArticleIndex:
+    """Local vector index over enriched articles for related-article lookup.
+
+    Vectors live in a memory-mapped float32 matrix (``vectors.f32``) that
+    grows by doubling; row metadata is appended to ``meta.jsonl``. Rows are
+    unit length, so cosine similarity is a single matrix-vector product.
+
+    The app, the API server and the batch CLI may share one index, so rows
+    are assigned under a file lock after picking up the metadata other
+    processes have appended.
+    """
+
+    def __init__(self, directory=DEFAULT_INDEX_DIR, dim=512, initial_capacity=1024):
+        self.directory = directory
+        self.dim = dim
+        self.initial_capacity = initial_capacity
+        self.vectors_path = os.path.join(directory, "vectors.f32")
+        self.meta_path = os.path.join(directory, "meta.jsonl")
+        self._lock = threading.Lock()
+        self._matrix = None
+        self._meta = None
+        self._meta_offset = 0
+        self._rows_by_url = None
+
+    def _file_lock(self) -> FileLock:
+        return FileLock(self.meta_path + ".lock")
+
+    def _read_meta(self):
+        """Append the metadata lines written since the last read; callers hold the file lock."""
+        if not os.path.exists(self.meta_path):
+            return
+        with open(self.meta_path, 'rb') as f:
+            f.seek(self._meta_offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                self._meta_offset += len(line)
+                if line.strip():
+                    meta = json.loads(line)
+                    if meta.get("url"):
+                        self._rows_by_url[meta["url"]] = len(self._meta)
+                    self._meta.append(meta)
+
+    def _open(self):
+        """Load the metadata and map the vector file; callers hold the file lock.
+
+        Later calls only read the rows other processes have added since.
+        """
+        meta_size = os.path.getsize(self.meta_path) if os.path.exists(self.meta_path) else 0
+        if self._meta is not None and meta_size >= self._meta_offset:
+            self._read_meta()
+            if len(self._meta) > self._matrix.shape[0]:
+                self._map(len(self._meta))
+            return
+
+        # First use, or the index was rebuilt by another process
+        os.makedirs(self.directory, exist_ok=True)
+        self._meta = []
+        self._meta_offset = 0
+        self._rows_by_url = {}
+        self._read_meta()
+
+        row_bytes = self.dim * 4
+        capacity = os.path.getsize(self.vectors_path) // row_bytes if os.path.exists(self.vectors_path) else 0
+        if capacity < len(self._meta):
+            # Metadata without vectors cannot be trusted, start over
+            print("Article index is inconsistent, rebuilding from scratch")
+            self._meta = []
+            self._meta_offset = 0
+            self._rows_by_url = {}
+            open(self.meta_path, 'w').close()
+            capacity = 0
+        self._map(max(capacity, self.initial_capacity))
+
+    def _map(self, capacity):
+        """(Re)map the vector file with room for at least ``capacity`` rows.
+
+        Never shrinks the file, which another process may have grown.
+        """
+        if self._matrix is not None:
+            self._matrix.flush()
+            del self._matrix
+        row_bytes = self.dim * 4
+        with open(self.vectors_path, 'ab') as f:
+            capacity = max(capacity, f.tell() // row_bytes)
+            f.truncate(capacity * row_bytes)
+        self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode='r+', shape=(capacity, self.dim))
+
+    def __len__(self):
+        with self._lock, self._file_lock():
+            self._open()
+            return len(self._meta)
+
+    def add_articles(self, articles: List[Dict[str, Any]]) -> int:
+        """Insert enriched articles that are not indexed yet; returns how many were added."""
+        with self._lock, self._file_lock():
+            self._open()
+            new_meta = []
+            for article in articles:
+                url = article.get("url", "")
+                if not url or url in self._rows_by_url:
+                    continue
+
+                row = len(self._meta) + len(new_meta)
+                if row >= self._matrix.shape[0]:
+                    self._map(self._matrix.shape[0] * 2)
+                self._matrix[row] = hash_features(article_text(article), self.dim)
+                self._rows_by_url[url] = row
+                new_meta.append({
+                    "url": url,
+                    "title": article.get("title", "Untitled"),
+                    "source": article.get("source", {}).get("name", "Unknown"),
+                    "publishedAt": article.get("publishedAt", ""),
+                })
+
+            if new_meta:
+                # Vectors are flushed before their metadata so a crash never leaves dangling rows
+                self._matrix.flush()
+                with open(self.meta_path, 'ab') as f:
+                    for meta in new_meta:
+                        line = (json.dumps(meta, ensure_ascii=False) + "\n").encode("utf-8")
+                        f.write(line)
+                        self._meta_offset += len(line)
+                self._meta.extend(new_meta)
+            return len(new_meta)
+
+    def query(self, text: str, k=5, min_score=0.0, exclude_urls=()) -> List[Dict[str, Any]]:
+        """Return the top-k indexed articles by cosine similarity to ``text``."""
+        vector = hash_features(text, self.dim)
+        with self._lock:
+            with self._file_lock():
+                self._open()
+            count = len(self._meta)
+            if count == 0 or not vector.any():
+                return []
+
+            scores = self._matrix[:count] @ vector
+            for url in exclude_urls:
+                row = self._rows_by_url.get(url)
+                if row is not None:
+                    scores[row] = -1.0
+
+            k = min(k, count)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [
+                {**self._meta[row], "score": round(float(scores[row]), 3)}
+                for row in top if scores[row] >= min_score
+            ]
+
+    def related_articles(self, article: Dict[str, Any], k=3, min_score=0.2) -> List[Dict[str, Any]]:
+        """Find earlier indexed articles related to an enriched article."""
+        return self.query(article_text(article), k=k, min_score=min_score, exclude_urls=[article.get("url", "")])
+
+article_index = ArticleIndex()
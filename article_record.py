@@ -0,0 +1,59 @@
+from collections.abc import MutableMapping
+
+class ArticleRecord(MutableMapping):
+    """Compact article passed through the pipeline.
+
+    Fields are stored in ``__slots__`` rather than a per-article dict, and the
+    record is enriched in place instead of being copied at every step. It
+    behaves like the article dicts it replaces (``get``, ``[]``, ``in``,
+    ``dict(record)``), so the app, knowledge graph and API code read it the
+    same way. Unknown keys are rejected so typos do not go unnoticed.
+    """
+
+    FIELDS = (
+        "title", "url", "publishedAt", "description", "content", "source",
+        "summary", "importance_score", "key_points", "status", "error", "related_articles",
+        "predicted_importance", "quick_filters",
+    )
+    __slots__ = FIELDS
+
+    def __init__(self, **fields):
+        for key, value in fields.items():
+            self[key] = value
+
+    def __getitem__(self, key):
+        if key in self.FIELDS:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                pass
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key not in self.FIELDS:
+            raise KeyError(f"{key!r} is not an article field")
+        setattr(self, key, value)
+
+    def __delitem__(self, key):
+        if key in self.FIELDS:
+            try:
+                delattr(self, key)
+                return
+            except AttributeError:
+                pass
+        raise KeyError(key)
+
+    def __iter__(self):
+        return (key for key in self.FIELDS if hasattr(self, key))
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"ArticleRecord({dict(self)!r})"
+
+def json_default(value):
+    """``json.dumps`` default that writes article records as plain objects."""
+    if isinstance(value, ArticleRecord):
+        return dict(value)
+    return str(value)
@@ -0,0 +1,251 @@
+import os
+import json
+import zlib
+import sqlite3
+import threading
+from datetime import datetime
+from typing import List, Dict, Any, Iterator
+from article_record import ArticleRecord
+
+# Default location, next to the legacy JSON dumps it replaces
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(__file__), "Previous Searches", "articles.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    title TEXT,
+    source TEXT,
+    published_at TEXT,
+    description TEXT,
+    content BLOB,
+    summary TEXT,
+    importance_score INTEGER,
+    key_points TEXT,
+    first_seen TEXT,
+    last_seen TEXT,
+    enriched_seq INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_articles_published ON articles (published_at);
+CREATE INDEX IF NOT EXISTS idx_articles_source ON articles (source, published_at);
+CREATE INDEX IF NOT EXISTS idx_articles_importance ON articles (importance_score, published_at);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_articles_enriched ON articles (enriched_seq);
+
+CREATE TABLE IF NOT EXISTS searches (
+    id INTEGER PRIMARY KEY,
+    query TEXT NOT NULL,
+    search_date TEXT NOT NULL,
+    UNIQUE (query, search_date)
+);
+CREATE TABLE IF NOT EXISTS search_articles (
+    search_id INTEGER NOT NULL REFERENCES searches (id),
+    article_id INTEGER NOT NULL REFERENCES articles (id),
+    PRIMARY KEY (search_id, article_id)
+);
+"""
+
+def compress_text(text: str) -> bytes:
+    return zlib.compress(text.encode("utf-8"), 6) if text else None
+
+def decompress_text(blob) -> str:
+    return zlib.decompress(blob).decode("utf-8") if blob else ""
+
+class ArticleStore:
+    """Append-only SQLite store of fetched articles, deduplicated by URL.
+
+    Each article is stored once, with its extracted text zlib-compressed,
+    no matter how many searches returned it; ``searches`` and
+    ``search_articles`` record which query found it on which day. Indexes on
+    published date, source and importance keep filtered range queries off a
+    full scan, and results are streamed from the cursor rather than loaded
+    into memory.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread; WAL lets readers run alongside a writer."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with self._schema_lock:
+                if not self._schema_ready:
+                    conn.executescript(SCHEMA)
+                    self._schema_ready = True
+            self._local.conn = conn
+        return conn
+
+    def save_search(self, query: str, search_date: str, articles: List[Dict[str, Any]]) -> int:
+        """Store the articles returned by one search; returns how many were new."""
+        now = datetime.now().isoformat(timespec="seconds")
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO searches (query, search_date) VALUES (?, ?)",
+                (query, search_date)
+            )
+            search_id = conn.execute(
+                "SELECT id FROM searches WHERE query = ? AND search_date = ?",
+                (query, search_date)
+            ).fetchone()["id"]
+
+            new_count = 0
+            for article in articles:
+                url = article.get("url", "")
+                if not url:
+                    continue
+                row = conn.execute("SELECT id FROM articles WHERE url = ?", (url,)).fetchone()
+                if row:
+                    article_id = row["id"]
+                    conn.execute("UPDATE articles SET last_seen = ? WHERE id = ?", (now, article_id))
+                else:
+                    article_id = conn.execute(
+                        """INSERT INTO articles (url, title, source, published_at, description, content, first_seen, last_seen)
+                           VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                        (
+                            url,
+                            article.get("title", "Untitled"),
+                            article.get("source", {}).get("name", "Unknown Source"),
+                            article.get("publishedAt", ""),
+                            article.get("description", ""),
+                            compress_text(article.get("content", "")),
+                            now,
+                            now,
+                        )
+                    ).lastrowid
+                    new_count += 1
+                conn.execute(
+                    "INSERT OR IGNORE INTO search_articles (search_id, article_id) VALUES (?, ?)",
+                    (search_id, article_id)
+                )
+        return new_count
+
+    def save_enrichment(self, articles: List[Dict[str, Any]]):
+        """Record summaries, importance scores and key points for stored articles.
+
+        Degraded and deferred articles have no real score and are left as they are.
+        An article's first enrichment gives it the next ``enriched_seq``, the
+        order ``articles_since`` reads in.
+        """
+        conn = self._connection()
+        with conn:
+            conn.executemany(
+                """UPDATE articles SET summary = ?, importance_score = ?, key_points = ?,
+                       enriched_seq = COALESCE(enriched_seq, (SELECT IFNULL(MAX(enriched_seq), 0) + 1 FROM articles))
+                   WHERE url = ?""",
+                [
+                    (
+                        article.get("summary", ""),
+                        article.get("importance_score"),
+                        json.dumps(article.get("key_points", []), ensure_ascii=False),
+                        article.get("url", ""),
+                    )
+                    for article in articles
+                    if article.get("url") and article.get("status") not in ("degraded", "deferred", "timed_out")
+                ]
+            )
+
+    def query_articles(self, start_date=None, end_date=None, sources=None, min_importance=None,
+                       limit=100, include_content=False) -> Iterator[Dict[str, Any]]:
+        """Stream stored articles, newest first, matching the given filters.
+
+        Dates are ISO ``YYYY-MM-DD`` strings; ``end_date`` is inclusive.
+        """
+        columns = "url, title, source, published_at, description, summary, importance_score, key_points"
+        if include_content:
+            columns += ", content"
+        clauses = []
+        params = []
+        if start_date:
+            clauses.append("published_at >= ?")
+            params.append(start_date)
+        if end_date:
+            # published_at carries a time, so compare against the start of the next day
+            clauses.append("published_at < date(?, '+1 day')")
+            params.append(end_date)
+        if sources:
+            clauses.append(f"source IN ({', '.join('?' for _ in sources)})")
+            params.extend(sources)
+        if min_importance is not None:
+            clauses.append("importance_score >= ?")
+            params.append(min_importance)
+
+        sql = f"SELECT {columns} FROM articles"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY published_at DESC LIMIT ?"
+        params.append(limit)
+
+        for row in self._connection().execute(sql, params):
+            yield self._row_to_article(row, include_content)
+
+    def articles_since(self, last_seq: int) -> Iterator[Dict[str, Any]]:
+        """Stream articles enriched after ``last_seq``, in enrichment order, with their ``enriched_seq``.
+
+        Articles are only returned once enriched, so key points saved after
+        the search that found them are never missed.
+        """
+        for row in self._connection().execute(
+            """SELECT enriched_seq, title, published_at, first_seen, key_points FROM articles
+               WHERE enriched_seq > ? ORDER BY enriched_seq""",
+            (last_seq,)
+        ):
+            yield {
+                "seq": row["enriched_seq"],
+                "title": row["title"],
+                "publishedAt": row["published_at"] or row["first_seen"],
+                "key_points": json.loads(row["key_points"]) if row["key_points"] else [],
+            }
+
+    def get_content(self, url: str) -> str:
+        """Return the extracted text of one stored article."""
+        row = self._connection().execute("SELECT content FROM articles WHERE url = ?", (url,)).fetchone()
+        return decompress_text(row["content"]) if row else ""
+
+    def _row_to_article(self, row, include_content=False) -> ArticleRecord:
+        """Convert a row back to the pipeline's article record."""
+        article = ArticleRecord(
+            title=row["title"],
+            url=row["url"],
+            publishedAt=row["published_at"],
+            description=row["description"],
+            source={"name": row["source"]},
+        )
+        if row["summary"] is not None:
+            article["summary"] = row["summary"]
+            article["importance_score"] = row["importance_score"]
+            article["key_points"] = json.loads(row["key_points"]) if row["key_points"] else []
+        if include_content:
+            article["content"] = decompress_text(row["content"])
+        return article
+
+    def import_json_archive(self, archive_dir: str) -> int:
+        """Load legacy "Previous Searches" JSON dumps into the store."""
+        imported = 0
+        for entry in sorted(os.scandir(archive_dir), key=lambda e: e.name):
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                with open(entry.path, 'r', encoding='utf-8') as f:
+                    saved = json.load(f)
+            except Exception as e:
+                print(f"Error reading saved search {entry.name}: {str(e)}")
+                continue
+            if "articles" not in saved:
+                continue
+            imported += self.save_search(saved.get("query", ""), saved.get("search_date", entry.name[:10]), saved["articles"])
+        return imported
+
+article_store = ArticleStore()
+
+if __name__ == "__main__":
+    archive_dir = os.path.dirname(DEFAULT_DB_PATH)
+    print(f"Imported {article_store.import_json_archive(archive_dir)} new articles from {archive_dir}")
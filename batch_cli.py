@@ -0,0 +1,113 @@
+"""Run the news pipeline headlessly for many queries at once.
+
+Example nightly run, writing one JSON result per combination and keeping
+the articles in the article store:
+
+    python batch_cli.py "Generative AI OR LLM" "AI regulation" --days 1 7 --article-count 10 20 --store
+
+All workers share the Perigon and OpenAI rate limiters from rate_limiter.py.
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from crew_workflow import get_summarized_news
+from article_record import json_default
+import profiling
+
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "Previous Searches", "batch_runs")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the AI news pipeline for many queries in parallel.")
+    parser.add_argument("queries", nargs="*", help="Search queries (Perigon query syntax)")
+    parser.add_argument("--queries-file", help="File with one query per line")
+    parser.add_argument("--days", type=int, nargs="+", default=[7], help="One or more look-back windows in days")
+    parser.add_argument("--article-count", type=int, nargs="+", default=[10], help="One or more article counts")
+    parser.add_argument("--sources", nargs="+", help="Only keep articles from these sources")
+    parser.add_argument("--workers", type=int, default=4, help="Number of pipeline runs in parallel")
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR, help="Where to write one JSON file per run")
+    parser.add_argument("--store", action="store_true", help="Also save articles and summaries to the article store")
+    parser.add_argument("--deadline", type=float, help="Time budget per run in seconds; unfinished articles are left unsummarized")
+    parser.add_argument("--profile", action="store_true", help="Write CPU and allocation profiles of each run to Previous Searches/profiles/")
+    args = parser.parse_args(argv)
+
+    queries = list(args.queries)
+    if args.queries_file:
+        with open(args.queries_file, 'r', encoding='utf-8') as f:
+            queries.extend(line.strip() for line in f if line.strip() and not line.startswith("#"))
+    if not queries:
+        parser.error("give at least one query or --queries-file")
+    args.queries = queries
+    return args
+
+def output_filename(query, days, article_count, sources=None):
+    """File name for one run, in the same style as the old saved searches.
+
+    The query is cut to 30 characters for readability, so a short hash of
+    the full query and sources keeps runs that share a prefix apart.
+    """
+    query_part = "".join(c if c.isalnum() or c in "-_ " else "_" for c in query[:30])
+    digest = hashlib.sha1("|".join([query] + sorted(sources or [])).encode("utf-8")).hexdigest()[:8]
+    return f"{datetime.now().strftime('%Y-%m-%d')}_{query_part}_{digest}_{days}d_{article_count}.json"
+
+def run_one(query, days, article_count, sources, output_dir, store, deadline=None):
+    """Run the pipeline for one parameter combination and write its result."""
+    started = time.perf_counter()
+    result = get_summarized_news(
+        query_terms=query,
+        days=days,
+        article_count=article_count,
+        preferred_sources=sources,
+        save_results=store,
+        deadline=deadline
+    )
+    path = os.path.join(output_dir, output_filename(query, days, article_count, sources))
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            "query": query,
+            "days": days,
+            "article_count": article_count,
+            "sources": sources,
+            "run_date": datetime.now().isoformat(timespec="seconds"),
+            "result": result
+        }, f, ensure_ascii=False, default=json_default)
+    return path, result, time.perf_counter() - started
+
+def main(argv=None):
+    args = parse_args(argv)
+    os.makedirs(args.output_dir, exist_ok=True)
+    if args.profile:
+        profiling.enabled = True
+
+    grid = list(itertools.product(args.queries, args.days, args.article_count))
+    print(f"Running {len(grid)} pipeline runs with {args.workers} workers")
+
+    failures = 0
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        futures = {
+            pool.submit(run_one, query, days, count, args.sources, args.output_dir, args.store, args.deadline): (query, days, count)
+            for query, days, count in grid
+        }
+        for future in as_completed(futures):
+            query, days, count = futures[future]
+            try:
+                path, result, elapsed = future.result()
+            except Exception as e:
+                failures += 1
+                print(f"FAILED  {query!r} days={days} articles={count}: {str(e)}")
+                continue
+            if result.get("error"):
+                failures += 1
+            status = "ERROR " if result.get("error") else "OK    "
+            print(f"{status}{query!r} days={days} articles={count}: "
+                  f"{len(result.get('articles', []))} articles in {elapsed:.1f}s -> {os.path.basename(path)}")
+
+    print(f"Done: {len(grid) - failures} succeeded, {failures} failed")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,21 +1,78 @@
 from crewai import Crew, Process, Task
 from agents import (
-    NewsExtractorTools, NewsSummarizerTools, NewsTrendAnalyzerTools, CombinedSummaryTools,
+    NewsSourceUnavailable, NewsExtractorTools, NewsSummarizerTools, NewsTrendAnalyzerTools, CombinedSummaryTools,
     news_extractor_agent, news_summarizer_agent, trend_analyzer_agent, executive_summarizer_agent
 )
+from knowledge_graph import build_knowledge_graph
+from graph_store import graph_store
+from article_index import article_index
+from article_store import article_store
+from pre_scorer import pre_scorer
+from topic_tracker import TopicTracker, topic_tracker
+from quick_filters import route_articles
+from deadline import Deadline, DeadlineExceeded
+from profiling import profiled
+import config
 
-def filter_by_sources(articles, preferred_sources):
-    """Filter articles based on source."""
-    if not preferred_sources:
-        return articles
-        
-    return [
-        article for article in articles
-        if article.get("source", {}).get("name") in preferred_sources
-    ]
+# Each refresh fades the topic counts kept across refreshes by this factor
+TOPIC_DECAY = getattr(config, "TOPIC_DECAY", 0.9)
+
+def update_graph_store(articles, trends):
+    """Merge this refresh into the persistent knowledge graph."""
+    try:
+        graph_store.merge(build_knowledge_graph(articles, trends))
+    except Exception as e:
+        print(f"Error updating knowledge graph store: {str(e)}")
+
+def link_related_articles(articles):
+    """Attach earlier related articles from the local index, then index this batch."""
+    try:
+        for article in articles:
+            article["related_articles"] = [
+                {"title": match["title"], "url": match["url"], "score": match["score"]}
+                for match in article_index.related_articles(article)
+            ]
+        article_index.add_articles(articles)
+    except Exception as e:
+        print(f"Error updating article index: {str(e)}")
+
+def update_topic_tracker(run_topics):
+    """Fold this refresh's topics into the tracker kept across refreshes."""
+    try:
+        topic_tracker.merge(run_topics, decay=TOPIC_DECAY)
+        topic_tracker.save()
+    except Exception as e:
+        print(f"Error updating topic tracker: {str(e)}")
+
+@profiled("get_summarized_news")
+def get_summarized_news(query_terms=None, days=7, article_count=10, preferred_sources=None,
+                        save_results=False, progress_callback=None, cancel_event=None, min_importance=None,
+                        route_filters=None, deadline=None):
+    """Run the full pipeline using CrewAI: extract, summarize, and analyze AI news.
+
+    With ``save_results`` the fetched articles and their summaries are kept
+    in the article store. With ``min_importance``, articles the local
+    pre-scorer expects well below it are returned unsummarized as "deferred".
+    ``route_filters`` ({name: query}) tags each article with the names of the
+    filters it matches in ``quick_filters``, so one fetch of their union can
+    serve every filter.
 
-def get_summarized_news(query_terms=None, days=7, article_count=10, preferred_sources=None):
-    """Run the full pipeline using CrewAI: extract, summarize, and analyze AI news."""
+    ``deadline`` is a time budget in seconds for the whole run, shared by
+    every fetch and LLM call. When it runs out, the run returns what is done:
+    articles not summarized in time are "timed_out" and show their Perigon
+    description, and those whose page was not extracted in time are
+    summarized from the description ("description_only").
+
+    ``progress_callback(stage, done, total, article)`` is called as the pipeline
+    advances, including once per summarized article. Setting ``cancel_event``
+    stops the run after the current article and returns what is done so far.
+    """
+    def report(stage, done=0, total=0, article=None):
+        if progress_callback:
+            progress_callback(stage, done, total, article)
+    
+    budget = Deadline(deadline)
+    
     try:
         # Initialize tools
         extractor_tools = NewsExtractorTools()
@@ -100,10 +157,27 @@ def get_summarized_news(query_terms=None, days=7, article_count=10, preferred_so
         # Alternative simpler implementation that doesn't require running the full crew
         def run_simplified_pipeline():
             # Step 1: Fetch news articles
-            latest_news = extractor_tools.fetch_latest_ai_news(query_terms, days, article_count)
-            
-            if preferred_sources:
-                latest_news = filter_by_sources(latest_news, preferred_sources)
+            report("Fetching articles")
+            # Source filtering happens in the request and before page downloads
+            try:
+                latest_news = extractor_tools.fetch_latest_ai_news(
+                    query_terms, days, article_count, save_results, sources=preferred_sources, deadline=budget
+                )
+            except NewsSourceUnavailable as e:
+                # An outage is reported as one, not as an empty result; errors are never cached
+                return {
+                    "articles": [],
+                    "trends": {},
+                    "error": str(e),
+                    "source_unavailable": True
+                }
+            except DeadlineExceeded as e:
+                return {
+                    "articles": [],
+                    "trends": {},
+                    "error": str(e),
+                    "timed_out": True
+                }
             
             if not latest_news:
                 return {
@@ -112,27 +186,75 @@ def get_summarized_news(query_terms=None, days=7, article_count=10, preferred_so
                     "error": "No articles found matching the criteria."
                 }
 
-            # Step 2: Summarize articles
-            summarized_news = summarizer_tools.batch_summarize_articles(latest_news)
+            # Step 1a: Assign articles to filters while their page text is still here
+            if route_filters:
+                route_articles(latest_news, route_filters)
+
+            # Step 1b: Defer articles the pre-scorer predicts below the threshold
+            latest_news, deferred_news = pre_scorer.split(latest_news, min_importance)
+            
+            # Step 2: Summarize articles, counting their topics as they come in
+            report("Summarizing articles", 0, len(latest_news))
+            run_topics = TopicTracker()
+            summarized_news = summarizer_tools.batch_summarize_articles(
+                latest_news,
+                progress_callback=lambda article, done, total: report("Summarizing articles", done, total, article),
+                cancel_event=cancel_event,
+                tracker=run_topics,
+                deadline=budget
+            )
+            
+            if cancel_event is not None and cancel_event.is_set():
+                return {
+                    "articles": summarized_news,
+                    "trends": {},
+                    "cancelled": True,
+                    "error": "Refresh was cancelled."
+                }
+            
+            if save_results:
+                try:
+                    article_store.save_enrichment(summarized_news)
+                except Exception as e:
+                    print(f"Error saving article summaries: {str(e)}")
+            
+            # Step 2b: Look up related earlier coverage and index the new articles
+            link_related_articles(summarized_news)
             
             # Step 3: Sort articles by importance
             summarized_news.sort(key=lambda x: x.get("importance_score", 0), reverse=True)
             
             # Step 4: Extract trends
-            trends = trend_tools.analyze_trends(summarized_news)
+            report("Analyzing trends", len(summarized_news), len(summarized_news))
+            trends = trend_tools.analyze_trends(summarized_news, run_topics)
+            update_topic_tracker(run_topics)
+            
+            # Step 4b: Merge into the knowledge graph kept across refreshes
+            update_graph_store(summarized_news, trends)
             
             # Step 5: Generate a combined summary
-            combined_summary = summary_tools.generate_combined_summary(summarized_news)
+            report("Writing executive summary", len(summarized_news), len(summarized_news))
+            combined_summary = summary_tools.generate_combined_summary(summarized_news, run_topics, budget)
+            
+            # Deferred articles are listed last and left out of trends and summaries
+            deferred_news.sort(key=lambda x: x["predicted_importance"], reverse=True)
             
             return {
-                "articles": summarized_news,
+                "articles": summarized_news + deferred_news,
                 "trends": trends,
                 "combined_summary": combined_summary,
                 "total_articles": len(summarized_news),
+                "degraded_articles": sum(1 for a in summarized_news if a.get("status") == "degraded"),
+                "deferred_articles": len(deferred_news),
+                "timed_out_articles": sum(1 for a in summarized_news if a.get("status") == "timed_out"),
+                "description_only_articles": sum(1 for a in summarized_news if a.get("status") == "description_only"),
+                "timed_out": budget.expired(),
                 "query_parameters": {
                     "days": days,
                     "article_count": article_count,
-                    "preferred_sources": preferred_sources or "All"
+                    "preferred_sources": preferred_sources or "All",
+                    "min_importance": min_importance,
+                    "deadline": deadline
                 }
             }
         
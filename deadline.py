@@ -0,0 +1,45 @@
+import time
+
+class DeadlineExceeded(Exception):
+    """Raised instead of starting (or waiting on) work after a refresh deadline."""
+
+class Deadline:
+    """Time budget of one refresh, shared by every fetch and LLM call in it.
+
+    ``timeout(default)`` caps a per-call timeout at the time left, so a call
+    started late cannot run past the deadline, and raises DeadlineExceeded
+    once none is left. ``Deadline(None)`` never expires.
+    """
+
+    def __init__(self, seconds=None):
+        self.seconds = seconds
+        self.expires_at = None if seconds is None else time.monotonic() + seconds
+
+    def remaining(self):
+        """Seconds left, or None without a deadline."""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    def timeout(self, default):
+        """``default`` capped at the time left; raises DeadlineExceeded if none is."""
+        remaining = self.remaining()
+        if remaining is None:
+            return default
+        if remaining <= 0:
+            raise DeadlineExceeded(f"Refresh deadline of {self.seconds:g}s passed")
+        return remaining if default is None else min(default, remaining)
+
+    def share(self, fraction: float) -> "Deadline":
+        """A deadline ``fraction`` of the remaining time away, for one stage."""
+        remaining = self.remaining()
+        if remaining is None:
+            return self
+        stage = Deadline(remaining * fraction)
+        stage.seconds = self.seconds
+        return stage
+
+NO_DEADLINE = Deadline()
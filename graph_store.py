@@ -0,0 +1,158 @@
+import os
+import threading
+import time
+import networkx as nx
+
+# Default location, next to the saved searches
+DEFAULT_STORE_PATH = os.path.join(os.path.dirname(__file__), "Previous Searches", "knowledge_graph.tsv")
+
+SECONDS_PER_DAY = 86400
+
+class PersistentGraphStore:
+    """Knowledge graph that accumulates across refreshes.
+
+    The graph is kept on disk as a tab-separated edge list. Node lines come
+    first and edges reference nodes by their line index, so node ids are only
+    written once:
+
+        N <group> <size> <last_seen> <id> <label> <title>
+        E <source_index> <target_index> <weight> <last_seen>
+
+    Edge weights decay exponentially with the configured half-life, and nodes
+    that have not been seen for ``prune_after_days`` are dropped on merge.
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH, half_life_days=14, prune_after_days=60, min_weight=0.05):
+        self.path = path
+        self.half_life_days = half_life_days
+        self.prune_after_days = prune_after_days
+        self.min_weight = min_weight
+        self._lock = threading.Lock()
+
+    def _decayed(self, weight, last_seen, now):
+        """Return the weight of an edge last reinforced at ``last_seen``."""
+        age_days = max(0.0, (now - last_seen) / SECONDS_PER_DAY)
+        return weight * 0.5 ** (age_days / self.half_life_days)
+
+    def _read(self):
+        """Read the raw nodes and edges from disk."""
+        nodes = []
+        edges = []
+        if not os.path.exists(self.path):
+            return nodes, edges
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                fields = line.rstrip("\n").split("\t")
+                if fields[0] == "N" and len(fields) == 7:
+                    nodes.append((fields[4], {
+                        "group": int(fields[1]),
+                        "size": float(fields[2]),
+                        "last_seen": float(fields[3]),
+                        "label": fields[5],
+                        "title": fields[6],
+                    }))
+                elif fields[0] == "E" and len(fields) == 5:
+                    edges.append((int(fields[1]), int(fields[2]), float(fields[3]), float(fields[4])))
+        return nodes, edges
+
+    def _write(self, G):
+        """Write the graph atomically in the edge-list format."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        index = {}
+        lines = []
+        for i, (node, attrs) in enumerate(G.nodes(data=True)):
+            index[node] = i
+            lines.append("N\t{}\t{:g}\t{:.0f}\t{}\t{}\t{}\n".format(
+                attrs.get("group", 0),
+                attrs.get("size", 10),
+                attrs.get("last_seen", 0),
+                _field(node),
+                _field(attrs.get("label", node)),
+                _field(attrs.get("title", node)),
+            ))
+        for source, target, attrs in G.edges(data=True):
+            lines.append("E\t{}\t{}\t{:.4f}\t{:.0f}\n".format(
+                index[source], index[target], attrs.get("weight", 1), attrs.get("last_seen", 0)
+            ))
+
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.writelines(lines)
+        os.replace(tmp_path, self.path)
+
+    def _load_raw(self):
+        """Load the stored graph without applying decay."""
+        nodes, edges = self._read()
+        G = nx.Graph()
+        G.add_nodes_from(nodes)
+        for source, target, weight, last_seen in edges:
+            if source < len(nodes) and target < len(nodes):
+                G.add_edge(nodes[source][0], nodes[target][0], weight=weight, last_seen=last_seen)
+        return G
+
+    def load(self, now=None, max_nodes=None):
+        """Load the graph with edge weights decayed to ``now``.
+
+        When ``max_nodes`` is given only the nodes with the highest weighted
+        degree are kept, which keeps the rendered history graph readable.
+        """
+        now = now or time.time()
+        G = self._load_raw()
+        for _, _, attrs in G.edges(data=True):
+            attrs["weight"] = self._decayed(attrs["weight"], attrs["last_seen"], now)
+
+        if max_nodes and G.number_of_nodes() > max_nodes:
+            ranked = sorted(G.degree(weight="weight"), key=lambda x: x[1], reverse=True)
+            G = G.subgraph([node for node, _ in ranked[:max_nodes]]).copy()
+        return G
+
+    def merge(self, run_graph, now=None):
+        """Merge the graph built from one refresh into the stored graph."""
+        now = now or time.time()
+        with self._lock:
+            G = self._load_raw()
+
+            # Nodes are refreshed with the latest attributes
+            for node, attrs in run_graph.nodes(data=True):
+                G.add_node(node, **{**attrs, "last_seen": now})
+
+            # Edges seen again are reinforced on top of their decayed weight
+            for source, target, attrs in run_graph.edges(data=True):
+                weight = attrs.get("weight", 1)
+                if G.has_edge(source, target):
+                    old = G[source][target]
+                    weight += self._decayed(old["weight"], old["last_seen"], now)
+                G.add_edge(source, target, weight=weight, last_seen=now)
+
+            self._prune(G, now)
+            self._write(G)
+            return G
+
+    def _prune(self, G, now):
+        """Drop faded edges, stale nodes and anything left isolated."""
+        faded = [
+            (source, target) for source, target, attrs in G.edges(data=True)
+            if self._decayed(attrs["weight"], attrs["last_seen"], now) < self.min_weight
+        ]
+        G.remove_edges_from(faded)
+
+        cutoff = now - self.prune_after_days * SECONDS_PER_DAY
+        stale = [
+            node for node, attrs in G.nodes(data=True)
+            if attrs.get("last_seen", 0) < cutoff or (G.degree(node) == 0 and attrs.get("group") != 1)
+        ]
+        G.remove_nodes_from(stale)
+
+    def last_modified(self):
+        """Return the store's modification time, or 0 if it does not exist yet."""
+        try:
+            return os.path.getmtime(self.path)
+        except OSError:
+            return 0
+
+def _field(value):
+    """Make a value safe to write as a single TSV field."""
+    return str(value).replace("\t", " ").replace("\n", " ")
+
+graph_store = PersistentGraphStore()
@@ -0,0 +1,18 @@
+from bs4 import BeautifulSoup
+
+# Imported by the parsing worker processes, so it must not import config
+
+def clean_html(raw: bytes, encoding: str = None) -> str:
+    """Readable text of an HTML page, without scripts and styles."""
+    soup = BeautifulSoup(raw, 'html.parser', from_encoding=encoding)
+
+    # Remove script and style elements
+    for element in soup(['script', 'style']):
+        element.decompose()
+
+    # Get text content
+    text = soup.get_text(separator='\n', strip=True)
+
+    # Clean up the text
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    return '\n'.join(lines)
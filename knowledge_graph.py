@@ -2,8 +2,12 @@ import streamlit as st
 import networkx as nx
 from pyvis.network import Network
 import re
+import json
+import hashlib
 import streamlit.components.v1 as components
 from typing import List, Dict, Any
+from graph_store import graph_store
+from profiling import profiled
 
 def clean_text(text):
     """Clean topic text by removing special characters and converting to lowercase."""
@@ -11,6 +15,7 @@ def clean_text(text):
         return ""
     return re.sub(r'[^\w\s]', '', text.lower())
 
+@profiled("build_knowledge_graph")
 def build_knowledge_graph(articles: List[Dict[Any, Any]], trends: Dict[Any, Any]):
     """Build a knowledge graph from articles and detected trends."""
     # Initialize graph
@@ -110,6 +115,73 @@ def generate_interactive_graph(G, height=500):
         print(f"Error generating graph: {str(e)}")
         return None
 
+class GraphRenderError(Exception):
+    """Raised by the cached renderers, so a failed render is retried instead of cached."""
+
+def graph_fingerprint(articles: List[Dict[Any, Any]], trends: Dict[Any, Any]) -> str:
+    """Hash the article and trend fields the graph is built from."""
+    payload = {
+        "topics": trends.get("trending_topics", []),
+        "articles": [
+            (
+                article.get("title", "Untitled"),
+                article.get("source", {}).get("name", "Unknown"),
+                article.get("importance_score", 0),
+                article.get("key_points", []),
+            )
+            for article in articles
+        ],
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def render_knowledge_graph(fingerprint: str, _articles, _trends, height=600):
+    """Build and render the graph once per fingerprint.
+
+    Returns the HTML together with the topic, article and edge counts so the
+    insight metrics never need the graph object itself.
+    """
+    G = build_knowledge_graph(_articles, _trends)
+    
+    # Count topic and article nodes in a single pass
+    topic_count = 0
+    article_count = 0
+    for _, group in G.nodes(data="group"):
+        if group == 1:
+            topic_count += 1
+        elif group == 2:
+            article_count += 1
+    
+    if G.number_of_nodes() == 0:
+        return None, 0, 0, 0
+    
+    html = generate_interactive_graph(G, height=height)
+    if html is None:
+        raise GraphRenderError("Failed to generate the knowledge graph")
+    return html, topic_count, article_count, G.number_of_edges()
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def render_history_graph(last_modified: float, max_nodes=150, height=600):
+    """Load and render the persistent graph once per store modification."""
+    G = graph_store.load(max_nodes=max_nodes)
+    
+    topic_count = 0
+    article_count = 0
+    for _, group in G.nodes(data="group"):
+        if group == 1:
+            topic_count += 1
+        elif group == 2:
+            article_count += 1
+    
+    if G.number_of_nodes() == 0:
+        return None, 0, 0, 0
+    
+    html = generate_interactive_graph(G, height=height)
+    if html is None:
+        raise GraphRenderError("Failed to generate the knowledge graph")
+    return html, topic_count, article_count, G.number_of_edges()
+
 def display_knowledge_graph(articles, trends):
     """Display a knowledge graph visualization in Streamlit."""
     st.header("🔍 AI Trends Knowledge Graph")
@@ -130,30 +202,42 @@ def display_knowledge_graph(articles, trends):
         - Click on a node to focus on its connections
         
         The size of connections indicates the importance of the relationship.
+        
+        Switch to **All refreshes** to see how topics have connected over the past weeks.
+        Older connections fade out over time.
         """)
     
-    # Build the graph
+    scope = st.radio("Graph scope", ["Current refresh", "All refreshes"], horizontal=True)
+    
+    # Build the graph (cached per result set, so filter reruns skip the rebuild)
     with st.spinner("Generating knowledge graph..."):
-        G = build_knowledge_graph(articles, trends)
+        try:
+            if scope == "All refreshes":
+                html, topic_count, article_count, edge_count = render_history_graph(
+                    graph_store.last_modified()
+                )
+            else:
+                html, topic_count, article_count, edge_count = render_knowledge_graph(
+                    graph_fingerprint(articles, trends), articles, trends
+                )
+        except GraphRenderError:
+            st.error("Failed to generate the knowledge graph. Please try again.")
+            return
         
-        if G.number_of_nodes() == 0:
+        if html is None:
             st.warning("Not enough data to generate a knowledge graph. Try adjusting your search parameters.")
             return
         
-        # Generate and display the interactive graph
-        html = generate_interactive_graph(G, height=600)
-        if html:
-            components.html(html, height=650)
-        else:
-            st.error("Failed to generate the knowledge graph. Please try again.")
+        # Display the interactive graph
+        components.html(html, height=650)
     
     # Graph insights
     st.subheader("Graph Insights")
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.metric("Topics", len([n for n, attrs in G.nodes(data=True) if attrs.get('group') == 1]))
+        st.metric("Topics", topic_count)
     with col2:
-        st.metric("Articles", len([n for n, attrs in G.nodes(data=True) if attrs.get('group') == 2]))
+        st.metric("Articles", article_count)
     with col3:
-        st.metric("Connections", G.number_of_edges())
\ No newline at end of file
+        st.metric("Connections", edge_count)
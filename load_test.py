@@ -0,0 +1,423 @@
+"""Find how many concurrent sessions one app.py instance can serve.
+
+    python load_test.py --sessions 1 5 10 20 40 --interactions 10
+
+For each session count a fresh ``streamlit run app.py`` server is started
+and that many simulated browsers connect to it over the Streamlit
+websocket protocol. Each session loads the page, waits for the initial
+refresh, refreshes with its own topic and look-back window, then toggles
+source filters, moves the importance slider and switches the graph scope,
+sending fragment reruns just as the browser does. Perigon, OpenAI and
+publisher pages are served by mock_backends.py, and the server's stores
+are redirected to a temporary directory so saved searches are untouched.
+
+For every session count it prints rerun latency percentiles, refresh
+time, and the server's CPU seconds and resident memory per session (read
+from /proc, so Linux only). The first level whose p95 rerun latency
+exceeds --slo-ms, or that has errors, is reported as the tipping point.
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import types
+import aiohttp
+from aiohttp import web
+from mock_backends import make_app
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+FINISHED_EARLY_FOR_RERUN = 2  # ForwardMsg.ScriptFinishedStatus
+TOPICS = ["All AI News", "Generative AI", "AI Ethics", "Research Breakthroughs", "Business Applications"]
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load test app.py with simulated sessions against mock backends.")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 5, 10, 20], help="Concurrent session counts to try, in order")
+    parser.add_argument("--interactions", type=int, default=10, help="Filter/graph interactions per session after its refresh")
+    parser.add_argument("--think-time", type=float, default=0.5, help="Seconds a session waits between interactions")
+    parser.add_argument("--ramp-seconds", type=float, default=2.0, help="Spread session starts over this many seconds")
+    parser.add_argument("--latency", type=float, default=0.2, help="Mock chat completion latency in seconds")
+    parser.add_argument("--shared-queries", action="store_true",
+                        help="Sessions reuse the five quick filters (cache hits) instead of distinct queries")
+    parser.add_argument("--keep-rate-limits", action="store_true", help="Keep the configured API rate limits")
+    parser.add_argument("--slo-ms", type=float, default=1000, help="p95 rerun latency above which the instance has tipped over")
+    parser.add_argument("--timeout", type=float, default=120, help="Seconds a session may wait for a refresh")
+    parser.add_argument("--port", type=int, default=8599, help="Port for the app server under test")
+    parser.add_argument("--data-dir", help="Keep the stores written during the test here instead of a temporary directory")
+    # Internal: run the app server in a child process
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--mock-url", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+def start_mock_backends(latency):
+    """Serve mock_backends on a free local port from a background thread."""
+    loop = asyncio.new_event_loop()
+    runner = web.AppRunner(make_app(latency))
+    loop.run_until_complete(runner.setup())
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    loop.run_until_complete(site.start())
+    port = site._server.sockets[0].getsockname()[1]
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return f"http://127.0.0.1:{port}"
+
+def configure(base_url, keep_rate_limits):
+    """Point config at the mocks; must run before the app modules are imported."""
+    try:
+        import config
+    except ImportError:
+        config = types.ModuleType("config")
+        sys.modules["config"] = config
+    config.PERIGON_API_KEY = getattr(config, "PERIGON_API_KEY", "load-test")
+    config.OPENAI_API_KEY = getattr(config, "OPENAI_API_KEY", "load-test")
+    config.PERIGON_API_URL = f"{base_url}/v1/all"
+    config.OPENAI_BASE_URL = f"{base_url}/v1"
+    if not keep_rate_limits:
+        config.PERIGON_REQUESTS_PER_SECOND = config.OPENAI_REQUESTS_PER_SECOND = 1000
+        config.PERIGON_BURST = config.OPENAI_BURST = 100
+
+def isolate_stores(directory):
+    """Redirect the article store, index, graph store, trend history, topic tracker and profiles."""
+    import profiling
+    from article_store import article_store
+    from article_index import article_index
+    from graph_store import graph_store
+    from trend_history import trend_history
+    from topic_tracker import topic_tracker
+    article_store.path = os.path.join(directory, "articles.db")
+    article_index.directory = os.path.join(directory, "article_index")
+    article_index.vectors_path = os.path.join(article_index.directory, "vectors.f32")
+    article_index.meta_path = os.path.join(article_index.directory, "meta.jsonl")
+    graph_store.path = os.path.join(directory, "knowledge_graph.tsv")
+    trend_history.archive_dir = directory
+    trend_history.path = os.path.join(directory, "trend_history.json")
+    topic_tracker.path = os.path.join(directory, "topics", "topic_tracker.json")
+    profiling.profile_dir = os.path.join(directory, "profiles")
+
+def serve(args):
+    """Child process: configure, then hand over to ``streamlit run``."""
+    configure(args.mock_url, args.keep_rate_limits)
+    isolate_stores(args.data_dir)
+    from streamlit.web import cli
+    sys.argv = [
+        "streamlit", "run", APP_PATH,
+        "--server.headless", "true",
+        "--server.port", str(args.port),
+        "--server.fileWatcherType", "none",
+        "--browser.gatherUsageStats", "false",
+    ]
+    return cli.main()
+
+class ServerProcess:
+    """An app server under test and its CPU/memory counters."""
+
+    def __init__(self, args, mock_url, data_dir):
+        command = [
+            sys.executable, os.path.abspath(__file__), "--serve",
+            "--port", str(args.port), "--mock-url", mock_url, "--data-dir", data_dir,
+        ]
+        if args.keep_rate_limits:
+            command.append("--keep-rate-limits")
+        self.url = f"127.0.0.1:{args.port}"
+        # Run from the data directory so files the app writes next to itself stay out of the repo
+        self.process = subprocess.Popen(command, cwd=data_dir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    async def wait_ready(self, timeout=60):
+        deadline = time.monotonic() + timeout
+        async with aiohttp.ClientSession() as http:
+            while time.monotonic() < deadline:
+                try:
+                    async with http.get(f"http://{self.url}/_stcore/health") as response:
+                        if response.status == 200:
+                            return
+                except aiohttp.ClientError:
+                    pass
+                await asyncio.sleep(0.2)
+        raise RuntimeError("app server did not start")
+
+    def cpu_seconds(self):
+        """User plus system CPU time of the server process."""
+        with open(f"/proc/{self.process.pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+    def resident_memory(self):
+        with open(f"/proc/{self.process.pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+    def stop(self):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+class SimulatedSession:
+    """One browser tab speaking the Streamlit websocket protocol.
+
+    Widget and fragment ids are read from the deltas the server sends, and
+    widget values are kept client-side and sent with every rerun, as the
+    frontend does. Only one rerun is in flight at a time.
+    """
+
+    def __init__(self, index, args, server_url):
+        self.index = index
+        self.args = args
+        self.server_url = server_url
+        self.rerun_seconds = []
+        self.refresh_seconds = []
+        self.errors = []
+        self.widgets = {}
+        self.states = {}
+        self.auto_rerun = None
+        self._finished = asyncio.Event()
+        self._ws = None
+
+    def _on_message(self, data):
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+        msg = ForwardMsg()
+        msg.ParseFromString(data)
+        kind = msg.WhichOneof("type")
+        if kind == "delta" and msg.delta.WhichOneof("type") == "new_element":
+            element = msg.delta.new_element
+            element_type = element.WhichOneof("type")
+            if element_type == "exception":
+                self.errors.append(f"{element.exception.type}: {element.exception.message}")
+                return
+            widget_id = getattr(getattr(element, element_type), "id", "")
+            if widget_id:
+                self.widgets[widget_id] = (element_type, getattr(element, element_type), msg.delta.fragment_id)
+        elif kind == "new_session" and not msg.new_session.fragment_ids_this_run:
+            # The browser drops fragment timers when a full run starts; fragments re-register them
+            self.auto_rerun = None
+        elif kind == "auto_rerun":
+            self.auto_rerun = (msg.auto_rerun.interval, msg.auto_rerun.fragment_id)
+        elif kind == "stop_auto_rerun":
+            self.auto_rerun = None
+        elif kind == "script_finished" and msg.script_finished != FINISHED_EARLY_FOR_RERUN:
+            # A run cut short by st.rerun() is followed by the full run we wait for
+            self._finished.set()
+
+    async def _reader(self):
+        async for message in self._ws:
+            if message.type == aiohttp.WSMsgType.BINARY:
+                self._on_message(message.data)
+
+    def _find(self, element_type, label=None, key=None):
+        """(widget id, widget proto, fragment id) of a rendered widget, or None."""
+        for widget_id, (found_type, widget, fragment_id) in self.widgets.items():
+            if found_type != element_type:
+                continue
+            if (label is not None and widget.label == label) or (key is not None and widget_id.endswith(f"-{key}")):
+                return widget_id, widget, fragment_id
+        return None
+
+    def _set(self, widget_id, **value):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+        state = WidgetState(id=widget_id)
+        for field, field_value in value.items():
+            if field == "double_array_value":
+                state.double_array_value.data.extend(field_value)
+            else:
+                setattr(state, field, field_value)
+        self.states[widget_id] = state
+
+    async def _rerun(self, fragment_id="", triggers=(), timed=True, is_auto_rerun=False):
+        """Send a rerun with the current widget states and wait for it to finish."""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        msg = BackMsg()
+        client_state = msg.rerun_script
+        client_state.query_string = ""
+        client_state.page_script_hash = ""
+        client_state.fragment_id = fragment_id
+        client_state.is_auto_rerun = is_auto_rerun
+        for state in self.states.values():
+            client_state.widget_states.widgets.add().CopyFrom(state)
+        for widget_id in triggers:
+            trigger = client_state.widget_states.widgets.add()
+            trigger.id = widget_id
+            trigger.trigger_value = True
+
+        self._finished.clear()
+        started = time.perf_counter()
+        await self._ws.send_bytes(msg.SerializeToString())
+        await asyncio.wait_for(self._finished.wait(), self.args.timeout)
+        if timed:
+            self.rerun_seconds.append(time.perf_counter() - started)
+
+    async def _wait_for_result(self):
+        """Poll the progress fragment, as the browser does, until articles are shown."""
+        started = time.perf_counter()
+        while self._find("slider", key="min_importance") is None or self.auto_rerun:
+            if time.perf_counter() - started > self.args.timeout:
+                raise TimeoutError("refresh did not finish")
+            if self.auto_rerun:
+                interval, fragment_id = self.auto_rerun
+                await asyncio.sleep(interval)
+                await self._rerun(fragment_id=fragment_id, timed=False, is_auto_rerun=True)
+            else:
+                await asyncio.sleep(0.2)
+
+    async def _refresh(self):
+        """Pick this session's topic and window, then press Refresh."""
+        self._set(self._find("radio", label="Topic")[0], string_value=TOPICS[self.index % len(TOPICS)])
+        if not self.args.shared_queries:
+            # A distinct look-back window per session makes every pipeline run distinct
+            days_id = self._find("slider", label="Days")[0]
+            self._set(days_id, double_array_value=[1 + (self.index // len(TOPICS)) % 30])
+        refresh_id = self._find("button", label="🔄 Refresh News")[0]
+        self.widgets.clear()
+        started = time.perf_counter()
+        await self._rerun(triggers=[refresh_id])
+        await self._wait_for_result()
+        self.refresh_seconds.append(time.perf_counter() - started)
+
+    async def _interact(self, step):
+        """One filter or graph interaction, rerunning only its fragment."""
+        kind = step % 3
+        if kind == 0:
+            sources = [
+                (widget_id, widget, fragment_id)
+                for widget_id, (element_type, widget, fragment_id) in self.widgets.items()
+                if element_type == "checkbox" and "-source_" in widget_id
+            ]
+            if sources:
+                widget_id, widget, fragment_id = sources[step % len(sources)]
+                current = self.states[widget_id].bool_value if widget_id in self.states else widget.default
+                self._set(widget_id, bool_value=not current)
+                return await self._rerun(fragment_id=fragment_id)
+        if kind == 1:
+            found = self._find("slider", key="min_importance")
+            if found:
+                self._set(found[0], double_array_value=[1 + step % 6])
+                return await self._rerun(fragment_id=found[2])
+        found = self._find("radio", label="Graph scope")
+        if found:
+            widget_id, widget, fragment_id = found
+            current = self.states[widget_id].string_value if widget_id in self.states else "Current refresh"
+            self._set(widget_id, string_value="All refreshes" if current == "Current refresh" else "Current refresh")
+            return await self._rerun(fragment_id=fragment_id)
+        await self._rerun()
+
+    async def run(self):
+        try:
+            async with aiohttp.ClientSession() as http:
+                async with http.ws_connect(f"ws://{self.server_url}/_stcore/stream", protocols=["streamlit"]) as ws:
+                    self._ws = ws
+                    reader = asyncio.create_task(self._reader())
+                    try:
+                        # Loading the page starts the initial refresh
+                        await self._rerun()
+                        await self._wait_for_result()
+                        await self._refresh()
+                        for step in range(self.args.interactions):
+                            await asyncio.sleep(self.args.think_time)
+                            await self._interact(step)
+                    finally:
+                        reader.cancel()
+        except Exception as e:
+            self.errors.append(f"{type(e).__name__}: {str(e)}")
+
+async def run_level(count, args, mock_url, data_dir):
+    """Run ``count`` sessions concurrently against a fresh server and summarise them."""
+    server = ServerProcess(args, mock_url, data_dir)
+    try:
+        await server.wait_ready()
+        # One unmeasured session imports the app modules and warms the caches
+        warm_up = SimulatedSession(-1, argparse.Namespace(**{**vars(args), "interactions": 0}), server.url)
+        await warm_up.run()
+
+        memory_before = server.resident_memory()
+        cpu_before = server.cpu_seconds()
+        started = time.perf_counter()
+        sessions = [SimulatedSession(i, args, server.url) for i in range(count)]
+        tasks = []
+        for session in sessions:
+            tasks.append(asyncio.create_task(session.run()))
+            await asyncio.sleep(args.ramp_seconds / count)
+        await asyncio.gather(*tasks)
+        wall = time.perf_counter() - started
+        cpu = server.cpu_seconds() - cpu_before
+        memory = server.resident_memory() - memory_before
+    finally:
+        server.stop()
+
+    reruns = [s for session in sessions for s in session.rerun_seconds]
+    refreshes = [s for session in sessions for s in session.refresh_seconds]
+    return {
+        "sessions": count,
+        "reruns": len(reruns),
+        "p50": percentile(reruns, 50) * 1000,
+        "p90": percentile(reruns, 90) * 1000,
+        "p95": percentile(reruns, 95) * 1000,
+        "p99": percentile(reruns, 99) * 1000,
+        "refresh_p50": percentile(refreshes, 50),
+        "refresh_max": max(refreshes, default=0.0),
+        "cpu_per_session": cpu / count,
+        "cpu_utilisation": cpu / wall,
+        "rss_per_session": max(0, memory) / count,
+        "errors": [error for session in sessions for error in session.errors],
+    }
+
+def print_level(level):
+    print(
+        f"{level['sessions']:>8} {level['reruns']:>7} "
+        f"{level['p50']:>7.0f} {level['p90']:>7.0f} {level['p95']:>7.0f} {level['p99']:>7.0f} "
+        f"{level['refresh_p50']:>8.1f} {level['refresh_max']:>8.1f} "
+        f"{level['cpu_per_session']:>9.2f} {level['cpu_utilisation']:>6.0%} "
+        f"{level['rss_per_session'] / 2**20:>8.1f} {len(level['errors']):>6}"
+    )
+
+async def run_levels(args, mock_url):
+    """Run every session count in turn; returns (last good, first bad) levels or None."""
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix="ai-news-load-")
+    print(f"Mock backends at {mock_url}, stores in {data_dir}, {os.cpu_count()} CPUs")
+    print(f"{'sessions':>8} {'reruns':>7} {'p50 ms':>7} {'p90 ms':>7} {'p95 ms':>7} {'p99 ms':>7} "
+          f"{'refr p50':>8} {'refr max':>8} {'cpu s/ses':>9} {'cpu':>6} {'MiB/ses':>8} {'errors':>6}")
+
+    tipped = None
+    previous = None
+    try:
+        for count in args.sessions:
+            level = await run_level(count, args, mock_url, data_dir)
+            print_level(level)
+            for error in sorted(set(level["errors"]))[:3]:
+                print(f"         error: {error}")
+            if tipped is None and (level["errors"] or level["p95"] > args.slo_ms):
+                tipped = (previous, level)
+            previous = level
+    finally:
+        if not args.data_dir:
+            shutil.rmtree(data_dir, ignore_errors=True)
+    return tipped
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.serve:
+        return serve(args)
+
+    # The mocks get their own loop and thread so they do not compete with the sessions
+    mock_url = start_mock_backends(args.latency)
+    tipped = asyncio.run(run_levels(args, mock_url))
+    if tipped is None:
+        print(f"Not tipped over up to {args.sessions[-1]} sessions (p95 rerun <= {args.slo_ms:.0f} ms, no errors)")
+        return 0
+    good, bad = tipped
+    reason = f"{len(bad['errors'])} errors" if bad["errors"] else f"p95 rerun {bad['p95']:.0f} ms > {args.slo_ms:.0f} ms"
+    if good is None:
+        print(f"Tipped over already at {bad['sessions']} sessions ({reason})")
+    else:
+        print(f"Tipping point between {good['sessions']} and {bad['sessions']} sessions ({reason})")
+    return 1
+
+if __name__ == "__main__":
+    raise SystemExit(main())
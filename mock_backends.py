@@ -0,0 +1,114 @@
+"""Local stand-ins for Perigon, OpenAI and publisher pages, for load testing.
+
+Start the mocks, then point config.py at them:
+
+    python mock_backends.py --port 8900 --latency 0.2
+
+    PERIGON_API_URL = "http://127.0.0.1:8900/v1/all"
+    OPENAI_BASE_URL = "http://127.0.0.1:8900/v1"
+
+Responses are deterministic for a given query so repeated runs are
+comparable; ``--latency`` adds a fixed delay to every completion.
+"""
+import argparse
+import asyncio
+import hashlib
+import random
+import time
+from aiohttp import web
+
+TOPICS = [
+    "large language models", "AI regulation", "robotics", "diffusion models", "AI chips",
+    "open source models", "AI safety", "enterprise AI", "autonomous agents", "computer vision"
+]
+SOURCES = ["techcrunch.com", "theverge.com", "wired.com", "arstechnica.com", "venturebeat.com", "reuters.com"]
+
+def make_articles(base_url, query, size):
+    """Deterministic fake Perigon articles for a query."""
+    rng = random.Random(hashlib.sha256(query.encode("utf-8")).hexdigest())
+    articles = []
+    for i in range(size):
+        topic, other = rng.sample(TOPICS, 2)
+        article_id = rng.randrange(10**6)
+        articles.append({
+            "title": f"New developments in {topic} and {other} ({article_id})",
+            "url": f"{base_url}/articles/{article_id}",
+            "pubDate": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(time.time() - rng.randrange(7 * 86400))),
+            "description": f"A look at how {topic} is shaping {other}.",
+            "content": "",
+            "source": {"domain": rng.choice(SOURCES)},
+        })
+    return articles
+
+def make_routes(latency):
+    routes = web.RouteTableDef()
+
+    @routes.get("/v1/all")
+    async def perigon_all(request):
+        base_url = f"{request.scheme}://{request.host}"
+        size = int(request.query.get("size", 10))
+        query = request.query.get("q", "")
+        articles = make_articles(base_url, query, size)
+        sources = request.query.getall("source", [])
+        if sources:
+            articles = [a for a in articles if a["source"]["domain"] in sources]
+        return web.json_response({"status": 200, "numResults": len(articles), "articles": articles})
+
+    @routes.get("/articles/{article_id}")
+    async def article_page(request):
+        article_id = request.match_info["article_id"]
+        paragraphs = "".join(
+            f"<p>Paragraph {i} of article {article_id} discussing {TOPICS[(int(article_id) + i) % len(TOPICS)]}.</p>"
+            for i in range(40)
+        )
+        html = f"<html><head><script>var x = 1;</script><style>p {{}}</style></head><body>{paragraphs}</body></html>"
+        return web.Response(text=html, content_type="text/html")
+
+    @routes.post("/v1/chat/completions")
+    async def chat_completions(request):
+        payload = await request.json()
+        prompt = payload["messages"][-1]["content"]
+        await asyncio.sleep(latency)
+
+        rng = random.Random(hashlib.sha256(prompt.encode("utf-8")).hexdigest())
+        if "IMPORTANCE:" in prompt:
+            points = ", ".join(rng.sample(TOPICS, 3))
+            content = (
+                f"SUMMARY: A mock summary of the article covering {points}.\n"
+                f"IMPORTANCE: {rng.randint(3, 9)}\n"
+                f"KEY_POINTS: {points}"
+            )
+        else:
+            content = "A mock executive summary of recent AI developments."
+
+        return web.json_response({
+            "id": f"chatcmpl-mock-{rng.randrange(10**9)}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "gpt-4o-mini"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4, "total_tokens": 0},
+        }, headers={
+            "x-ratelimit-limit-requests": "10000",
+            "x-ratelimit-remaining-requests": "9999",
+            "x-ratelimit-reset-requests": "6ms",
+        })
+
+    return routes
+
+def make_app(latency=0.0):
+    app = web.Application()
+    app.add_routes(make_routes(latency))
+    return app
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mock Perigon, OpenAI and publisher backends.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every chat completion")
+    args = parser.parse_args()
+    web.run_app(make_app(args.latency), host=args.host, port=args.port)
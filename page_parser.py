@@ -0,0 +1,72 @@
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from html_text import clean_html
+import config
+
+def available_cores() -> int:
+    """CPU cores this process may run on (respects affinity and container limits)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+# Parser processes; with a single core pages are parsed in-process
+PARSE_WORKERS = getattr(config, "PARSE_WORKERS", None) or min(available_cores(), 8)
+
+class ParsePool:
+    """Parses downloaded pages in worker processes, outside the caller's GIL.
+
+    Workers receive the raw page bytes, which pickle as a single copy, and
+    send back only the cleaned text, so no parse tree crosses a process
+    boundary. Workers are spawned on first use, since forking a process
+    that is running threads (as Streamlit is) is unsafe. With one worker
+    the pool would only add overhead, so pages are parsed in-process.
+    Workers only import ``html_text``, which does not need ``config``.
+
+    If the pool breaks (a worker died or could not start), pages are parsed
+    in-process from then on rather than paying for a new pool every page.
+    """
+
+    def __init__(self, workers=PARSE_WORKERS):
+        self.workers = workers
+        self._executor = None
+        self._broken = False
+        self._lock = threading.Lock()
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None and self.workers > 1 and not self._broken:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def clean(self, raw: bytes, encoding: str = None, timeout=None) -> str:
+        """Cleaned text of ``raw``; blocks the calling thread, not the others.
+
+        Raises TimeoutError if a worker has not finished within ``timeout``.
+        """
+        pool = self._pool()
+        if pool is None:
+            return clean_html(raw, encoding)
+        try:
+            return pool.submit(clean_html, raw, encoding).result(timeout=timeout)
+        except BrokenProcessPool as e:
+            with self._lock:
+                if self._executor is pool:
+                    print(f"Error in page parsing pool, parsing in-process from now on: {str(e)}")
+                    self._executor.shutdown(wait=False, cancel_futures=True)
+                    self._executor = None
+                    self._broken = True
+            return clean_html(raw, encoding)
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+parse_pool = ParsePool()
@@ -0,0 +1,115 @@
+import threading
+import time
+import numpy as np
+from typing import List, Dict, Any, Optional, Tuple
+import config
+from article_index import hash_features
+from article_store import article_store
+
+# Articles are only skipped when the prediction plus this margin is still
+# below the threshold, so borderline articles are always summarized
+DEFAULT_MARGIN = getattr(config, "PRESCORE_MARGIN", 1.5)
+
+def prescore_text(article: Dict[str, Any]) -> str:
+    """The text available before summarization that the pre-scorer reads."""
+    return "\n".join(part for part in (article.get("title", ""), article.get("description", "")) if part)
+
+class ImportancePreScorer:
+    """Predicts an article's importance score locally, before any LLM call.
+
+    A ridge regression over TF-IDF weighted hashed features of the title and
+    description, trained on the scored articles in the article store. The
+    model is refitted on first use after ``retrain_seconds`` and predicts
+    nothing until ``min_training_articles`` scored articles exist.
+    """
+
+    def __init__(self, store=article_store, dim=512, alpha=1.0, min_training_articles=50,
+                 max_training_articles=5000, retrain_seconds=3600):
+        self.store = store
+        self.dim = dim
+        self.alpha = alpha
+        self.min_training_articles = min_training_articles
+        self.max_training_articles = max_training_articles
+        self.retrain_seconds = retrain_seconds
+        self._model = None
+        self._trained_at = 0.0
+        self._lock = threading.Lock()
+
+    def _hashed(self, texts: List[str]) -> np.ndarray:
+        return np.vstack([hash_features(text, self.dim) for text in texts])
+
+    def _weighted(self, raw: np.ndarray, idf: np.ndarray) -> np.ndarray:
+        """Apply IDF weights and re-normalise each row."""
+        X = raw * idf
+        norms = np.linalg.norm(X, axis=1, keepdims=True)
+        return X / np.where(norms > 0, norms, 1.0)
+
+    def train(self) -> bool:
+        """Fit the model on archived scored articles; False if there are too few."""
+        articles = list(self.store.query_articles(min_importance=1, limit=self.max_training_articles))
+        self._trained_at = time.time()
+        if len(articles) < self.min_training_articles:
+            self._model = None
+            return False
+
+        texts = [prescore_text(a) for a in articles]
+        y = np.array([a["importance_score"] for a in articles], dtype=np.float64)
+
+        # Inverse document frequency per hash bucket
+        raw = self._hashed(texts)
+        document_frequency = np.count_nonzero(raw, axis=0)
+        idf = (np.log((1 + len(texts)) / (1 + document_frequency)) + 1).astype(np.float32)
+
+        X = self._weighted(raw, idf).astype(np.float64)
+        x_mean = X.mean(axis=0)
+        y_mean = y.mean()
+        Xc = X - x_mean
+        weights = np.linalg.solve(Xc.T @ Xc + self.alpha * np.eye(self.dim), Xc.T @ (y - y_mean))
+        self._model = (idf, x_mean, y_mean, weights)
+        print(f"Importance pre-scorer trained on {len(articles)} articles")
+        return True
+
+    def _current_model(self):
+        with self._lock:
+            if time.time() - self._trained_at > self.retrain_seconds:
+                try:
+                    self.train()
+                except Exception as e:
+                    print(f"Error training importance pre-scorer: {str(e)}")
+                    self._model = None
+            return self._model
+
+    def predict(self, articles: List[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """Predicted importance (1-10) per article, or None without a model."""
+        model = self._current_model()
+        if model is None or not articles:
+            return None
+        idf, x_mean, y_mean, weights = model
+        X = self._weighted(self._hashed([prescore_text(a) for a in articles]), idf)
+        return np.clip(y_mean + (X - x_mean) @ weights, 1, 10)
+
+    def split(self, articles: List[Dict[str, Any]], min_importance=None,
+              margin=DEFAULT_MARGIN) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Split articles into those worth summarizing and those deferred.
+
+        Deferred articles are predicted below ``min_importance`` even after
+        adding ``margin``; they are marked ``status: "deferred"`` with their
+        ``predicted_importance`` and are not sent to the LLM.
+        """
+        if not min_importance or min_importance <= 1:
+            return articles, []
+        predictions = self.predict(articles)
+        if predictions is None:
+            return articles, []
+
+        keep, deferred = [], []
+        for article, predicted in zip(articles, predictions):
+            if predicted + margin < min_importance:
+                article.pop("content", None)
+                article.update(status="deferred", predicted_importance=round(float(predicted), 1))
+                deferred.append(article)
+            else:
+                keep.append(article)
+        return keep, deferred
+
+pre_scorer = ImportancePreScorer()
@@ -0,0 +1,238 @@
+import os
+import sys
+import json
+import time
+import pstats
+import cProfile
+import threading
+import functools
+import tracemalloc
+from collections import Counter, deque
+from datetime import datetime
+from typing import List, Dict, Any
+import config
+
+# Opt-in: set PROFILING = True in config.py (or profiling.enabled at runtime)
+enabled = getattr(config, "PROFILING", False)
+
+DEFAULT_PROFILE_DIR = os.path.join(os.path.dirname(__file__), "Previous Searches", "profiles")
+# Where runs are written unless ProfileRun is given a directory; may be changed at runtime
+profile_dir = DEFAULT_PROFILE_DIR
+SAMPLE_INTERVAL = getattr(config, "PROFILING_SAMPLE_INTERVAL", 0.005)
+TOP_N = 15
+
+# Summaries of recent runs, newest last, for the diagnostics panel
+recent_runs = deque(maxlen=20)
+
+_local = threading.local()
+_tracing_lock = threading.Lock()
+_tracing_runs = 0
+_tracing_starts = 0
+_run_counter = 0
+
+def frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+class StackSampler(threading.Thread):
+    """Samples one thread's Python stack at a fixed interval.
+
+    The counts are full call stacks, written in the folded format
+    (``outer;inner;leaf count``) that flamegraph.pl, speedscope and
+    inferno read. cProfile only records caller/callee pairs, so it cannot
+    produce these on its own.
+    """
+
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(frame_label(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+def _start_tracing():
+    """Start tracemalloc for one run; returns (alone, start count).
+
+    The traced peak is process-wide, so it is only reset (and only
+    meaningful) for a run that has tracemalloc to itself: one that started
+    alone and that no other run started after.
+    """
+    global _tracing_runs, _tracing_starts
+    with _tracing_lock:
+        if _tracing_runs == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _tracing_runs += 1
+        _tracing_starts += 1
+        if _tracing_runs == 1:
+            tracemalloc.reset_peak()
+        return _tracing_runs == 1, _tracing_starts
+
+def _stop_tracing(exclusive_since=None):
+    """Stop tracing for one run; returns the peak if the run overlapped no other."""
+    global _tracing_runs
+    with _tracing_lock:
+        peak = None
+        if exclusive_since is not None and exclusive_since == _tracing_starts:
+            peak = tracemalloc.get_traced_memory()[1]
+        _tracing_runs -= 1
+        if _tracing_runs == 0:
+            tracemalloc.stop()
+        return peak
+
+def cpu_hotspots(profile: cProfile.Profile, limit=TOP_N) -> List[Dict[str, Any]]:
+    """Functions with the most time spent in their own code."""
+    stats = pstats.Stats(profile).stats
+    rows = [
+        {
+            "function": f"{func} ({os.path.basename(filename)}:{line})",
+            "calls": calls,
+            "self_ms": round(self_time * 1000, 2),
+            "total_ms": round(total_time * 1000, 2),
+        }
+        for (filename, line, func), (_, calls, self_time, total_time, _) in stats.items()
+    ]
+    rows.sort(key=lambda row: row["self_ms"], reverse=True)
+    return rows[:limit]
+
+def allocation_hotspots(before, after, limit=TOP_N) -> List[Dict[str, Any]]:
+    """Source lines that allocated the most memory still held at the end of the run."""
+    return [
+        {
+            "location": str(diff.traceback[0]),
+            "size_kib": round(diff.size_diff / 1024, 1),
+            "count": diff.count_diff,
+        }
+        for diff in after.compare_to(before, "lineno")[:limit]
+        if diff.size_diff > 0
+    ]
+
+class ProfileRun:
+    """One profiled call: cProfile, a stack sampler and tracemalloc together.
+
+    ``stop()`` writes the run to its own directory under ``directory``
+    (default: the module's ``profile_dir``): ``cpu.pstats`` (for pstats or
+    snakeviz), ``stacks.folded`` (for flamegraph tools), ``allocations.txt``
+    and ``summary.json``.
+    """
+
+    def __init__(self, name: str, directory=None):
+        global _run_counter
+        with _tracing_lock:
+            _run_counter += 1
+            sequence = _run_counter
+        self.name = name
+        self.path = os.path.join(directory or profile_dir, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{sequence:04d}-{name}")
+        self.summary = None
+
+    def start(self):
+        exclusive, starts = _start_tracing()
+        self._exclusive_since = starts if exclusive else None
+        self._sampler = None
+        try:
+            self._snapshot = tracemalloc.take_snapshot()
+            self._sampler = StackSampler(threading.get_ident())
+            self._sampler.start()
+            self._profile = cProfile.Profile()
+            self._started = time.perf_counter()
+            # Raises ValueError if another profiler is active (process-wide on Python 3.12+)
+            self._profile.enable()
+        except Exception:
+            if self._sampler is not None and self._sampler.is_alive():
+                self._sampler.stop()
+            _stop_tracing()
+            self._snapshot = None
+            raise
+        return self
+
+    def stop(self):
+        self._profile.disable()
+        wall_ms = (time.perf_counter() - self._started) * 1000
+        self._sampler.stop()
+        snapshot = tracemalloc.take_snapshot()
+        peak = _stop_tracing(self._exclusive_since)
+
+        self.summary = {
+            "name": self.name,
+            "started": datetime.now().isoformat(timespec="seconds"),
+            "wall_ms": round(wall_ms, 1),
+            # None when another run traced at the same time and shared the peak
+            "peak_kib": None if peak is None else round(peak / 1024, 1),
+            "samples": sum(self._sampler.stacks.values()),
+            "cpu_hotspots": cpu_hotspots(self._profile),
+            "allocation_hotspots": allocation_hotspots(self._snapshot, snapshot),
+            "path": self.path,
+        }
+        try:
+            self._write(snapshot)
+        except Exception as e:
+            print(f"Error writing profile for {self.name}: {str(e)}")
+        recent_runs.append(self.summary)
+        self._snapshot = None
+        return self.summary
+
+    def _write(self, snapshot):
+        os.makedirs(self.path, exist_ok=True)
+        self._profile.dump_stats(os.path.join(self.path, "cpu.pstats"))
+        with open(os.path.join(self.path, "stacks.folded"), 'w', encoding='utf-8') as f:
+            f.write(self._sampler.folded())
+        with open(os.path.join(self.path, "allocations.txt"), 'w', encoding='utf-8') as f:
+            for stat in snapshot.statistics("traceback")[:50]:
+                f.write(f"{stat.size / 1024:.1f} KiB in {stat.count} blocks\n")
+                f.write("\n".join(stat.traceback.format()) + "\n\n")
+        with open(os.path.join(self.path, "summary.json"), 'w', encoding='utf-8') as f:
+            json.dump(self.summary, f, indent=2, ensure_ascii=False)
+
+class profiled:
+    """Profile a block or function when profiling is enabled.
+
+    Usable as ``with profiled("name"):`` or as a ``@profiled("name")``
+    decorator. When profiling is off it costs one attribute check. A block
+    entered while its thread is already being profiled is recorded as part
+    of the outer run, since a thread can only have one active cProfile.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._run = None
+
+    def __enter__(self):
+        if enabled and not getattr(_local, "active", False):
+            _local.active = True
+            try:
+                self._run = ProfileRun(self.name).start()
+            except Exception as e:
+                _local.active = False
+                print(f"Error starting profiler for {self.name}: {str(e)}")
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._run is not None:
+            run, self._run = self._run, None
+            try:
+                run.stop()
+            finally:
+                _local.active = False
+        return False
+
+    def __call__(self, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with profiled(self.name):
+                return func(*args, **kwargs)
+        return wrapper
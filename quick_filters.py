@@ -0,0 +1,122 @@
+import re
+from functools import lru_cache
+from typing import List, Dict, Any, Callable
+
+# Sidebar quick filters and the Perigon query each one stands for
+QUICK_FILTERS = {
+    "All AI News": "Artificial Intelligence OR AI OR machine learning OR LLM",
+    "Generative AI": "Generative AI OR LLM OR GPT OR diffusion model",
+    "AI Ethics": "AI ethics OR AI bias OR AI regulation OR responsible AI",
+    "Research Breakthroughs": "AI research breakthrough OR new AI model OR AI paper",
+    "Business Applications": "AI business application OR enterprise AI OR AI startup",
+}
+
+QUERY_TOKEN = re.compile(r'"([^"]*)"|(\()|(\))|([^\s()"]+)')
+
+def union_query(queries) -> str:
+    """One query matching everything any of ``queries`` matches."""
+    unique = list(dict.fromkeys(q.strip() for q in queries if q and q.strip()))
+    if len(unique) == 1:
+        return unique[0]
+    return " OR ".join(f"({q})" for q in unique)
+
+def term_pattern(term: str) -> str:
+    """Whole-word pattern for a term or phrase, allowing a plural on each word."""
+    return r"\b" + r"\s+".join(re.escape(word) + "s?" for word in term.lower().split()) + r"\b"
+
+def _tokenize(query: str) -> List[tuple]:
+    tokens = []
+    for phrase, open_paren, close_paren, word in QUERY_TOKEN.findall(query):
+        if open_paren:
+            tokens.append(("(", None))
+        elif close_paren:
+            tokens.append((")", None))
+        elif word in ("AND", "OR", "NOT"):
+            tokens.append((word, None))
+        elif phrase or word:
+            tokens.append(("TERM", phrase or word))
+    return tokens
+
+@lru_cache(maxsize=64)
+def compile_query(query: str) -> Callable[[str], bool]:
+    """Compile a Perigon-style boolean query into a matcher over lowercased text.
+
+    Supports OR, AND, NOT, parentheses and quoted phrases; adjacent terms
+    are ANDed, as Perigon does. Each term becomes one precompiled regex,
+    so matching an article costs a few regex searches and no parsing.
+    """
+    tokens = _tokenize(query)
+    position = 0
+
+    def peek():
+        return tokens[position][0] if position < len(tokens) else None
+
+    def parse_or():
+        nonlocal position
+        branches = [parse_and()]
+        while peek() == "OR":
+            position += 1
+            branches.append(parse_and())
+        if len(branches) == 1:
+            return branches[0]
+        return lambda text: any(branch(text) for branch in branches)
+
+    def parse_and():
+        nonlocal position
+        parts = [parse_unary()]
+        while peek() not in (None, "OR", ")"):
+            if peek() == "AND":
+                position += 1
+            parts.append(parse_unary())
+        if len(parts) == 1:
+            return parts[0]
+        return lambda text: all(part(text) for part in parts)
+
+    def parse_unary():
+        nonlocal position
+        kind = peek()
+        if kind == "NOT":
+            position += 1
+            operand = parse_unary()
+            return lambda text: not operand(text)
+        if kind == "(":
+            position += 1
+            inner = parse_or()
+            if peek() == ")":
+                position += 1
+            return inner
+        if kind == "TERM":
+            term = tokens[position][1]
+            position += 1
+            pattern = re.compile(term_pattern(term))
+            return lambda text: pattern.search(text) is not None
+        # Stray operator or parenthesis: skip it
+        position += 1
+        if position >= len(tokens):
+            return lambda text: True
+        return parse_unary()
+
+    if not tokens:
+        return lambda text: True
+    return parse_or()
+
+def article_text(article: Dict[str, Any]) -> str:
+    """Lowercased text a quick filter is matched against."""
+    parts = [article.get("title", ""), article.get("description", ""), article.get("content", ""),
+             article.get("summary", "")]
+    parts.extend(point for point in article.get("key_points") or [] if isinstance(point, str))
+    return "\n".join(part for part in parts if part).lower()
+
+def route_articles(articles: List[Dict[str, Any]], filters: Dict[str, str]):
+    """Set each article's ``quick_filters`` to the names of the filters it matches.
+
+    Perigon also matches text that is not available locally, so an article
+    that matches no filter here is given the first (broadest) one.
+    """
+    matchers = [(name, compile_query(query)) for name, query in filters.items()]
+    for article in articles:
+        text = article_text(article)
+        matched = [name for name, matches in matchers if matches(text)]
+        if not matched and matchers:
+            matched = [matchers[0][0]]
+        article["quick_filters"] = matched
@@ -0,0 +1,184 @@
+import re
+import threading
+import time
+import config
+
+DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+def parse_duration(value):
+    """Parse a rate-limit reset value such as "20ms", "1.5s", "6m0s" or "30" into seconds."""
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * DURATION_UNITS[unit] for amount, unit in parts)
+
+def header_value(headers, *names):
+    """First header present among ``names`` (case-insensitive mappings)."""
+    if headers is None:
+        return None
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            return value
+    return None
+
+class RateLimiter:
+    """Thread-safe adaptive token bucket shared by every caller of one API.
+
+    ``acquire()`` blocks until a request may be sent, so threads in a batch
+    run and Streamlit sessions in the same process all stay under one limit.
+    The rate adapts to the API: a 429 halves it and pauses every caller for
+    the server's Retry-After (or an exponential backoff), rate-limit headers
+    showing an exhausted quota pause until the reset, and each success
+    creeps the rate back towards its configured value.
+    """
+
+    def __init__(self, rate_per_second: float, burst: int = 1, min_rate_per_second: float = None):
+        self.base_rate = rate_per_second
+        self.rate_per_second = rate_per_second
+        self.min_rate_per_second = min_rate_per_second or rate_per_second / 20
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._consecutive_limits = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout=None) -> bool:
+        """Wait for a token and take it.
+
+        With ``timeout``, gives up and returns False instead of waiting
+        longer than that for the token.
+        """
+        give_up_at = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                else:
+                    self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate_per_second)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return True
+                    wait = (1 - self._tokens) / self.rate_per_second
+            if give_up_at is not None and time.monotonic() + wait > give_up_at:
+                return False
+            time.sleep(wait)
+
+    def _pause(self, seconds):
+        """Hold back every caller for ``seconds``; callers hold the lock."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0
+
+    def record_success(self, headers=None):
+        """Note a successful call and read any rate-limit headers it carried."""
+        with self._lock:
+            self._consecutive_limits = 0
+            self.rate_per_second = min(self.base_rate, self.rate_per_second + self.base_rate * 0.05)
+
+            remaining = header_value(headers, "x-ratelimit-remaining-requests", "x-ratelimit-remaining")
+            if remaining is not None:
+                try:
+                    exhausted = int(float(remaining)) <= 0
+                except ValueError:
+                    exhausted = False
+                if exhausted:
+                    reset = parse_duration(header_value(headers, "x-ratelimit-reset-requests", "x-ratelimit-reset"))
+                    self._pause(reset if reset is not None else 1.0)
+
+    def record_rate_limited(self, headers=None):
+        """Back off after a 429: slow down and pause until the server allows more."""
+        with self._lock:
+            self._consecutive_limits += 1
+            self.rate_per_second = max(self.min_rate_per_second, self.rate_per_second / 2)
+            retry_after = parse_duration(header_value(
+                headers, "retry-after", "x-ratelimit-reset-requests", "x-ratelimit-reset"
+            ))
+            if retry_after is None:
+                retry_after = min(60.0, 2.0 ** self._consecutive_limits)
+            self._pause(retry_after)
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint whose circuit breaker is open."""
+
+class CircuitBreaker:
+    """Fails fast after repeated failures and lets a trial call through later.
+
+    Closed: calls go through. After ``failure_threshold`` consecutive
+    failures the breaker opens and ``before_call()`` raises
+    CircuitOpenError. Once ``recovery_timeout`` seconds have passed a single
+    trial call is allowed (half-open); its success closes the breaker, its
+    failure opens it again. A trial that ends without either (the caller
+    gave up before the call) must be handed back with ``release_trial()``.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_call(self) -> bool:
+        """Raise CircuitOpenError if the endpoint should not be called now.
+
+        Returns True when this call is the half-open trial.
+        """
+        with self._lock:
+            if self.state == "closed":
+                return False
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.recovery_timeout:
+                self.state = "half_open"
+                self._trial_in_flight = False
+            if self.state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            raise CircuitOpenError(f"{self.name} is unavailable, circuit breaker is open")
+
+    def release_trial(self):
+        """Let another trial through after one that recorded no outcome."""
+        with self._lock:
+            if self.state == "half_open":
+                self._trial_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == "half_open" or self._failures >= self.failure_threshold:
+                if self.state != "open":
+                    print(f"Circuit breaker for {self.name} opened after {self._failures} failures")
+                self.state = "open"
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+# Limits can be tuned in config.py
+perigon_limiter = RateLimiter(
+    getattr(config, "PERIGON_REQUESTS_PER_SECOND", 2),
+    getattr(config, "PERIGON_BURST", 2)
+)
+openai_limiter = RateLimiter(
+    getattr(config, "OPENAI_REQUESTS_PER_SECOND", 5),
+    getattr(config, "OPENAI_BURST", 5)
+)
+
+perigon_breaker = CircuitBreaker("Perigon API")
+openai_breaker = CircuitBreaker("OpenAI API")
@@ -0,0 +1,76 @@
+import threading
+import time
+from crew_workflow import get_summarized_news
+from result_cache import shared_results, make_key
+
+class RefreshJob:
+    """Runs get_summarized_news on a background thread for one session.
+
+    The UI polls ``snapshot()`` to show articles as each summary completes.
+    Starting a new refresh cancels the previous job; a cancelled job stops
+    after the article it is working on and its result is discarded.
+
+    Jobs go through the process-wide result cache, so sessions asking for the
+    same parameters share one pipeline run.
+    """
+
+    def __init__(self, **params):
+        self.params = params
+        self.key = make_key(**params)
+        self.stage = "Starting"
+        self.done = 0
+        self.total = 0
+        self.articles = []
+        self.result = None
+        self.started_at = time.time()
+        self.cancel_event = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """Ask the job to stop; it finishes the current article first."""
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    @property
+    def finished(self):
+        return self.result is not None
+
+    def _on_progress(self, stage, done, total, article):
+        with self._lock:
+            self.stage = stage
+            self.done = done
+            self.total = total
+            if article is not None:
+                self.articles.append(article)
+
+    def _run(self):
+        try:
+            result = shared_results.run(
+                self.key,
+                lambda progress_callback, cancel_event: get_summarized_news(
+                    **self.params,
+                    progress_callback=progress_callback,
+                    cancel_event=cancel_event
+                ),
+                progress_callback=self._on_progress,
+                cancel_event=self.cancel_event
+            )
+        except Exception as e:
+            print(f"Error in background refresh: {str(e)}")
+            result = {"articles": [], "trends": {}, "error": str(e)}
+        with self._lock:
+            self.stage = "Done"
+            self.result = result
+
+    def snapshot(self):
+        """Return (stage, done, total, articles so far) under the job lock."""
+        with self._lock:
+            return self.stage, self.done, self.total, list(self.articles)
@@ -0,0 +1,136 @@
+import threading
+import time
+
+def make_key(query_terms=None, days=7, article_count=10, preferred_sources=None, min_importance=None,
+             route_filters=None, deadline=None, **_options):
+    """Cache key for one set of get_summarized_news parameters.
+
+    The deadline is part of the key, since a run cut short by one must not
+    be served to a caller without it. Other options (such as
+    ``save_results``) do not change the result.
+    """
+    sources = tuple(sorted(preferred_sources)) if preferred_sources else None
+    # A threshold of 1 or less defers nothing, same as no threshold
+    threshold = min_importance if min_importance and min_importance > 1 else None
+    routes = tuple(sorted(route_filters.items())) if route_filters else None
+    return (query_terms or "", days, article_count, sources, threshold, routes, deadline)
+
+class _Flight:
+    """One in-progress computation that several callers can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.events = []
+        self.listeners = []
+        self.cancel_events = []
+
+    def is_set(self):
+        """Cancelled only once every caller waiting on this flight has cancelled."""
+        return bool(self.cancel_events) and all(event.is_set() for event in self.cancel_events)
+
+class SharedResultCache:
+    """Process-wide TTL cache of pipeline results with single-flight coalescing.
+
+    Streamlit runs every session in the same process, so one instance is
+    shared by all users. Concurrent callers asking for the same key share a
+    single run: the first caller computes, the others subscribe to its
+    progress events and receive its result. Results with an ``error`` or
+    with degraded (unsummarized) articles are returned but not cached.
+    Results cut short by a deadline are kept for ``partial_ttl_seconds``
+    only, so sessions share them without serving them for long.
+    """
+
+    def __init__(self, ttl_seconds=900, max_entries=64, partial_ttl_seconds=60):
+        self.ttl_seconds = ttl_seconds
+        self.partial_ttl_seconds = partial_ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._in_flight = {}
+
+    def get(self, key):
+        """Return the cached result for ``key`` if it has not expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.time():
+                return entry[1]
+            self._entries.pop(key, None)
+            return None
+
+    def run(self, key, compute, progress_callback=None, cancel_event=None):
+        """Return the result for ``key``, computing it at most once at a time.
+
+        ``compute(progress_callback, cancel_event)`` produces the result. The
+        cancel event it receives is set only when every caller sharing the
+        run has set its own ``cancel_event``.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.time():
+                return entry[1]
+
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._in_flight[key] = flight
+            if cancel_event is not None:
+                flight.cancel_events.append(cancel_event)
+            if progress_callback:
+                # Late subscribers first catch up on the progress they missed
+                for event in flight.events:
+                    progress_callback(*event)
+                flight.listeners.append(progress_callback)
+
+        if not leader:
+            flight.done.wait()
+            return flight.result
+
+        def broadcast(*event):
+            with self._lock:
+                flight.events.append(event)
+                listeners = list(flight.listeners)
+            for listener in listeners:
+                listener(*event)
+
+        try:
+            result = compute(broadcast, flight)
+        except Exception as e:
+            print(f"Error in shared pipeline run: {str(e)}")
+            result = {"articles": [], "trends": {}, "error": str(e)}
+
+        with self._lock:
+            # An invalidation during the run means this result must not be cached
+            if self._in_flight.get(key) is flight:
+                del self._in_flight[key]
+                if not (result.get("error") or result.get("cancelled") or result.get("degraded_articles")):
+                    ttl = self.partial_ttl_seconds if result.get("timed_out") else self.ttl_seconds
+                    self._store(key, result, ttl)
+            flight.result = result
+        flight.done.set()
+        return result
+
+    def _store(self, key, result, ttl_seconds):
+        """Insert a result, evicting the entry closest to expiry when full."""
+        if len(self._entries) >= self.max_entries and key not in self._entries:
+            oldest = min(self._entries, key=lambda k: self._entries[k][0])
+            del self._entries[oldest]
+        self._entries[key] = (time.time() + ttl_seconds, result)
+
+    def invalidate(self, key=None):
+        """Drop ``key`` (or everything) and detach matching runs in progress.
+
+        A detached run still delivers its result to the callers already
+        waiting on it, but the result is not cached and new callers start a
+        fresh run.
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._in_flight.clear()
+            else:
+                self._entries.pop(key, None)
+                self._in_flight.pop(key, None)
+
+shared_results = SharedResultCache()
@@ -0,0 +1,59 @@
+import hashlib
+import threading
+import time
+from typing import Dict, Any, Optional, Tuple
+
+def article_key(article: Dict[str, Any]) -> str:
+    """Stable identity of an article within a summarized set."""
+    return article.get("url") or article.get("title", "")
+
+def set_fingerprint(keys) -> str:
+    """Fingerprint of an article set, independent of order."""
+    return hashlib.sha256("\n".join(sorted(keys)).encode("utf-8")).hexdigest()
+
+class SummaryCache:
+    """Executive summaries keyed by the fingerprint of the articles they cover.
+
+    Besides exact lookups, ``closest`` finds the cached summary whose article
+    set covers the largest share of a new set, so a refresh that only adds
+    an article or two can reuse or update an earlier summary.
+    """
+
+    def __init__(self, ttl_seconds=86400, max_entries=64):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, fingerprint: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry and entry[0] > time.time():
+                return entry[2]
+            self._entries.pop(fingerprint, None)
+            return None
+
+    def closest(self, keys) -> Tuple[Optional[frozenset], Optional[str], float]:
+        """(cached keys, summary, share of ``keys`` covered) of the best match."""
+        keys = frozenset(keys)
+        best = (None, None, 0.0)
+        now = time.time()
+        with self._lock:
+            for expires, cached_keys, summary in self._entries.values():
+                if expires <= now or not keys:
+                    continue
+                overlap = len(keys & cached_keys) / len(keys)
+                if overlap > best[2]:
+                    best = (cached_keys, summary, overlap)
+        return best
+
+    def store(self, keys, summary: str):
+        keys = frozenset(keys)
+        fingerprint = set_fingerprint(keys)
+        with self._lock:
+            if len(self._entries) >= self.max_entries and fingerprint not in self._entries:
+                oldest = min(self._entries, key=lambda k: self._entries[k][0])
+                del self._entries[oldest]
+            self._entries[fingerprint] = (time.time() + self.ttl_seconds, keys, summary)
+
+summary_cache = SummaryCache()
@@ -0,0 +1,229 @@
+import os
+import json
+import threading
+from typing import List, Dict, Any, Tuple
+from file_lock import FileLock
+
+# In its own folder, so trend history does not take it for a saved search
+DEFAULT_TRACKER_PATH = os.path.join(os.path.dirname(__file__), "Previous Searches", "topics", "topic_tracker.json")
+
+# Words to exclude from topics
+STOP_WORDS = {
+    'and', 'the', 'to', 'of', 'in', 'for', 'with', 'on', 'at', 'from', 'by', 'about',
+    'as', 'an', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 'how', 'what',
+    'when', 'where', 'who', 'why', 'which', 'that', 'this', 'these', 'those'
+}
+
+def article_topic_weights(article: Dict[str, Any]) -> Dict[str, int]:
+    """Weighted topic mentions of one article from its title and key points.
+
+    Title words and bigrams count once; key point terms count double, and a
+    whole short key point double again.
+    """
+    weights = {}
+
+    if title := article.get("title"):
+        title_lower = ''.join(c if c.isalnum() or c.isspace() else ' ' for c in title.lower())
+        words = [w for w in title_lower.split() if len(w) > 3 and w not in STOP_WORDS]
+        for i in range(len(words) - 1):
+            bigram = f"{words[i]} {words[i+1]}"
+            weights[bigram] = weights.get(bigram, 0) + 1
+        for word in words:
+            weights[word] = weights.get(word, 0) + 1
+
+    for point in article.get("key_points") or []:
+        if isinstance(point, str):
+            point_lower = point.lower().strip()
+            if len(point_lower) > 3 and not any(c in point_lower for c in [',', ';']):
+                weights[point_lower] = weights.get(point_lower, 0) + 4
+            for term in point_lower.split(','):
+                term = term.strip()
+                if term and len(term) > 3 and term not in STOP_WORDS:
+                    weights[term] = weights.get(term, 0) + 2
+
+    return weights
+
+class SpaceSaving:
+    """Approximate heavy hitters of a weighted stream in bounded memory.
+
+    Keeps at most ``capacity`` counters (Metwally et al., Space-Saving). A
+    new item arriving when all counters are taken replaces the smallest
+    one and inherits its count, which is recorded as the item's possible
+    overestimate. Any item whose true weight exceeds total/capacity is
+    guaranteed to be tracked, and counts are exact while fewer than
+    ``capacity`` distinct items have been seen.
+    """
+
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+
+    def add(self, item: str, weight=1):
+        if item in self.counts:
+            self.counts[item] += weight
+        elif len(self.counts) < self.capacity:
+            self.counts[item] = weight
+            self.errors[item] = 0
+        else:
+            smallest = min(self.counts, key=self.counts.get)
+            floor = self.counts.pop(smallest)
+            del self.errors[smallest]
+            self.counts[item] = floor + weight
+            self.errors[item] = floor
+
+    def top(self, k: int) -> List[Tuple[str, float]]:
+        """The ``k`` largest (item, count) pairs, largest first."""
+        return sorted(self.counts.items(), key=lambda x: x[1], reverse=True)[:k]
+
+    def scale(self, factor: float):
+        """Multiply every count by ``factor`` so older mentions fade."""
+        for item in self.counts:
+            self.counts[item] *= factor
+            self.errors[item] *= factor
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"capacity": self.capacity, "counts": self.counts, "errors": self.errors}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SpaceSaving":
+        sketch = cls(data.get("capacity", 256))
+        sketch.counts = dict(data.get("counts", {}))
+        sketch.errors = {item: data.get("errors", {}).get(item, 0) for item in sketch.counts}
+        return sketch
+
+class TopicTracker:
+    """Streaming topic counts shared by trend analysis and the executive summary.
+
+    Articles are added once, as they are enriched. ``topics`` tracks the
+    weighted title and key point terms behind ``analyze_trends`` and
+    ``key_points`` the raw key points that steer the executive summary;
+    both are Space-Saving sketches, so memory stays bounded however many
+    articles are added and the top-k can be read at any moment.
+
+    A tracker with a ``path`` is shared with other processes (the app, the
+    API server, the batch CLI). It rereads the file when another process
+    has saved it, and ``save()`` replays this process's unsaved changes
+    onto the file's current contents under a file lock, so no process
+    overwrites another's merges.
+    """
+
+    def __init__(self, capacity=256, path=None):
+        self.capacity = capacity
+        self.path = path
+        self.topics = SpaceSaving(capacity)
+        self.key_points = SpaceSaving(capacity)
+        self.articles_seen = 0
+        self._lock = threading.Lock()
+        self._loaded_version = False
+        # Changes since the last save: (decay, topics, key points, articles)
+        self._unsaved = []
+
+    def _read(self):
+        """Replace the sketches with the saved ones plus unsaved changes; callers hold the lock."""
+        self.topics = SpaceSaving(self.capacity)
+        self.key_points = SpaceSaving(self.capacity)
+        self.articles_seen = 0
+        self._loaded_version = None
+        if os.path.exists(self.path):
+            try:
+                version = self._file_version()
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.topics = SpaceSaving.from_dict(data["topics"])
+                self.key_points = SpaceSaving.from_dict(data["key_points"])
+                self.articles_seen = data.get("articles_seen", 0)
+                self._loaded_version = version
+            except Exception as e:
+                print(f"Error loading topic tracker, starting empty: {str(e)}")
+        for change in self._unsaved:
+            self._apply(*change)
+
+    def _file_version(self):
+        """Modification time and size of the saved file, or None without one."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load(self):
+        """Reread the saved sketches on first use or after another process saved them; callers hold the lock."""
+        if self.path is not None and self._file_version() != self._loaded_version:
+            self._read()
+
+    def _apply(self, decay, topics, key_points, articles_seen):
+        if decay != 1.0:
+            self.topics.scale(decay)
+            self.key_points.scale(decay)
+        for topic, count in topics:
+            self.topics.add(topic, count)
+        for point, count in key_points:
+            self.key_points.add(point, count)
+        self.articles_seen += articles_seen
+
+    def _change(self, decay, topics, key_points, articles_seen):
+        """Apply a change and, for a saved tracker, remember it until the next save."""
+        self._load()
+        self._apply(decay, topics, key_points, articles_seen)
+        if self.path is not None:
+            self._unsaved.append((decay, topics, key_points, articles_seen))
+
+    def add_article(self, article: Dict[str, Any]):
+        key_points = [(point.lower().strip(), 1) for point in article.get("key_points") or [] if isinstance(point, str)]
+        with self._lock:
+            self._change(1.0, list(article_topic_weights(article).items()), key_points, 1)
+
+    def add_articles(self, articles: List[Dict[str, Any]]):
+        for article in articles:
+            self.add_article(article)
+
+    def top_topics(self, k=10) -> List[Tuple[str, float]]:
+        with self._lock:
+            self._load()
+            return self.topics.top(k)
+
+    def top_key_points(self, k=8) -> List[Tuple[str, float]]:
+        with self._lock:
+            self._load()
+            return self.key_points.top(k)
+
+    def refresh(self) -> int:
+        """Pick up changes saved by other processes; returns ``articles_seen``."""
+        with self._lock:
+            self._load()
+            return self.articles_seen
+
+    def merge(self, other: "TopicTracker", decay=1.0):
+        """Add another tracker's counts, first fading ours by ``decay``."""
+        with other._lock:
+            topics = list(other.topics.counts.items())
+            key_points = list(other.key_points.counts.items())
+            articles_seen = other.articles_seen
+        if not articles_seen:
+            return
+        with self._lock:
+            self._change(decay, topics, key_points, articles_seen)
+
+    def save(self):
+        """Merge unsaved changes into the file and write it atomically.
+
+        The file lock keeps other processes from saving in between the
+        reread and the write, and off the same temp file.
+        """
+        with self._lock, FileLock(self.path + ".lock"):
+            self._read()
+            data = {
+                "topics": self.topics.to_dict(),
+                "key_points": self.key_points.to_dict(),
+                "articles_seen": self.articles_seen
+            }
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'), ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self._loaded_version = self._file_version()
+            self._unsaved = []
+
+# Topics across refreshes, saved between runs
+topic_tracker = TopicTracker(path=DEFAULT_TRACKER_PATH)
@@ -0,0 +1,178 @@
+import os
+import json
+import threading
+from datetime import datetime, timedelta
+from typing import List, Dict, Any
+from agents import NewsTrendAnalyzerTools
+from article_store import article_store
+
+# Saved searches written by NewsExtractorTools.fetch_latest_ai_news(save_results=True)
+DEFAULT_ARCHIVE_DIR = os.path.join(os.path.dirname(__file__), "Previous Searches")
+DEFAULT_HISTORY_PATH = os.path.join(DEFAULT_ARCHIVE_DIR, "trend_history.json")
+
+WINDOWS = (7, 30, 90)
+
+class TrendHistory:
+    """Per-day topic counts over the saved search archive.
+
+    New articles are read from the article store past an enrichment
+    watermark, so each stored article is counted once, key points included.
+    Legacy JSON dumps are still ingested: each file is parsed once and its
+    per-day counts are kept so a file that is overwritten on the same day
+    is replaced instead of double counted. The summed per-day counts are the aggregate that window
+    queries read, so answering "what is rising over 30 days" never touches
+    the archive.
+    """
+
+    def __init__(self, archive_dir=DEFAULT_ARCHIVE_DIR, path=DEFAULT_HISTORY_PATH, store=article_store):
+        self.archive_dir = archive_dir
+        self.path = path
+        self.store = store
+        self.trend_tools = NewsTrendAnalyzerTools()
+        self._lock = threading.Lock()
+        self._state = None
+
+    def _load(self):
+        """Load the precomputed aggregates from disk on first use."""
+        if self._state is not None:
+            return
+        self._state = {"files": {}, "days": {}, "store_last_seq": 0}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._state = json.load(f)
+            except Exception as e:
+                print(f"Error loading trend history, rebuilding: {str(e)}")
+
+    def _save(self):
+        """Write the aggregates atomically."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._state, f, separators=(',', ':'), ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def _apply(self, day_counts: Dict[str, Dict[str, int]], sign: int):
+        """Add (or with sign=-1 remove) per-day counts from the aggregate."""
+        days = self._state["days"]
+        for day, counts in day_counts.items():
+            totals = days.setdefault(day, {})
+            for topic, count in counts.items():
+                total = totals.get(topic, 0) + sign * count
+                if total > 0:
+                    totals[topic] = total
+                else:
+                    totals.pop(topic, None)
+            if not totals:
+                days.pop(day, None)
+
+    def count_by_day(self, articles: List[Dict[str, Any]], fallback_day: str) -> Dict[str, Dict[str, int]]:
+        """Group topic counts by the day each article was published."""
+        by_day = {}
+        for article in articles:
+            day = (article.get("publishedAt") or fallback_day)[:10]
+            counts = by_day.setdefault(day, {})
+            for topic, count in self.trend_tools.count_topics([article]).items():
+                counts[topic] = counts.get(topic, 0) + count
+        return by_day
+
+    def _update_from_store(self) -> int:
+        """Count articles enriched in the article store since the last update."""
+        if not os.path.exists(self.store.path):
+            return 0
+
+        last_seq = self._state.get("store_last_seq", 0)
+        added = 0
+        by_day = {}
+        for article in self.store.articles_since(last_seq):
+            day = (article["publishedAt"] or "")[:10]
+            counts = by_day.setdefault(day, {})
+            for topic, count in self.trend_tools.count_topics([article]).items():
+                counts[topic] = counts.get(topic, 0) + count
+            last_seq = article["seq"]
+            added += 1
+
+        if added:
+            self._apply(by_day, 1)
+            self._state["store_last_seq"] = last_seq
+        return added
+
+    def update(self) -> int:
+        """Ingest stored articles and archive files that are new since the last update."""
+        if not os.path.isdir(self.archive_dir):
+            return 0
+
+        with self._lock:
+            self._load()
+            files = self._state["files"]
+            changed = self._update_from_store()
+            for entry in os.scandir(self.archive_dir):
+                if not entry.name.endswith(".json") or entry.path == self.path:
+                    continue
+                mtime = entry.stat().st_mtime
+                known = files.get(entry.name)
+                if known and known["mtime"] == mtime:
+                    continue
+
+                try:
+                    with open(entry.path, 'r', encoding='utf-8') as f:
+                        saved = json.load(f)
+                except Exception as e:
+                    print(f"Error reading saved search {entry.name}: {str(e)}")
+                    continue
+
+                if known:
+                    self._apply(known["days"], -1)
+                day_counts = self.count_by_day(saved.get("articles", []), saved.get("search_date", entry.name[:10]))
+                self._apply(day_counts, 1)
+                files[entry.name] = {"mtime": mtime, "days": day_counts}
+                changed += 1
+
+            if changed:
+                self._save()
+            return changed
+
+    def _window_totals(self, end: datetime, window_days: int) -> Dict[str, int]:
+        """Sum the per-day counts for the ``window_days`` days ending at ``end``."""
+        days = self._state["days"]
+        totals = {}
+        for offset in range(window_days):
+            day = (end - timedelta(days=offset)).strftime('%Y-%m-%d')
+            for topic, count in days.get(day, {}).items():
+                totals[topic] = totals.get(topic, 0) + count
+        return totals
+
+    def topic_momentum(self, window_days=7, top_n=5, today=None) -> Dict[str, Any]:
+        """Compare the last window with the one before it.
+
+        Returns the topics whose counts grew and shrank the most, each as
+        ``(topic, current_count, previous_count)``.
+        """
+        today = today or datetime.today()
+        with self._lock:
+            self._load()
+            current = self._window_totals(today, window_days)
+            previous = self._window_totals(today - timedelta(days=window_days), window_days)
+
+        changes = [
+            (topic, current.get(topic, 0), previous.get(topic, 0))
+            for topic in set(current) | set(previous)
+        ]
+        rising = sorted(
+            [c for c in changes if c[1] > c[2]],
+            key=lambda x: (x[1] - x[2], x[1]),
+            reverse=True
+        )[:top_n]
+        falling = sorted(
+            [c for c in changes if c[1] < c[2]],
+            key=lambda x: (x[2] - x[1], x[2]),
+            reverse=True
+        )[:top_n]
+
+        return {
+            "window_days": window_days,
+            "rising": rising,
+            "falling": falling
+        }
+
+trend_history = TrendHistory()